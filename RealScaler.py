@@ -2,15 +2,38 @@
 # Standard library imports
 import sys
 from functools  import cache
+from math       import ceil as math_ceil, gcd as math_gcd
 from time       import sleep
 from webbrowser import open as open_browser
 from subprocess import run  as subprocess_run
+from subprocess import Popen as subprocess_Popen, PIPE as subprocess_PIPE
 from shutil     import rmtree as remove_directory
+from shutil     import which  as shutil_which
+from argparse   import ArgumentParser
+from hashlib    import sha256
+from zlib       import compressobj as zlib_compressobj, crc32 as zlib_crc32
+from struct     import pack as struct_pack
+from platform   import machine as platform_machine, processor as platform_processor
+from tracemalloc import (
+    start             as tracemalloc_start,
+    stop              as tracemalloc_stop,
+    reset_peak        as tracemalloc_reset_peak,
+    get_traced_memory as tracemalloc_get_traced_memory
+)
 from timeit     import default_timer as timer
 
 from typing    import Callable
-from threading import Thread
-from itertools import repeat
+from types     import SimpleNamespace
+from threading import (
+    get_ident as threading_get_ident,
+    Thread,
+    Lock,
+    Event,
+    Barrier,
+    local as threading_local
+)
+from itertools import repeat, starmap as itertools_starmap
+from queue     import Queue as queue_Queue, Empty as queue_Empty, Full as queue_Full
 from multiprocessing.pool import ThreadPool
 from multiprocessing import ( 
     Process, 
@@ -26,10 +49,14 @@ from json import (
 from os import (
     sep        as os_separator,
     devnull    as os_devnull,
-    environ    as os_environ,
     makedirs   as os_makedirs,
     listdir    as os_listdir,
-    remove     as os_remove
+    remove     as os_remove,
+    replace    as os_replace,
+    getpid     as os_getpid,
+    stat       as os_stat,
+    kill       as os_kill,
+    cpu_count  as os_cpu_count
 )
 
 from os.path import (
@@ -44,10 +71,48 @@ from os.path import (
 
 # Third-party library imports
 from natsort          import natsorted
-from moviepy.video.io import ImageSequenceClip 
-from onnxruntime      import InferenceSession
+from onnxruntime      import (
+    InferenceSession,
+    SessionOptions,
+    GraphOptimizationLevel,
+    ExecutionMode,
+    get_available_providers,
+    __version__ as onnxruntime_version
+)
+
+try:
+    # Optional, used to generate the AI model variants (fp32, uint8 input/output)
+    from onnx import (
+        load        as onnx_load,
+        save        as onnx_save,
+        helper      as onnx_helper,
+        numpy_helper,
+        TensorProto
+    )
+    from onnxruntime.quantization import (
+        quantize_static,
+        QuantFormat,
+        QuantType,
+        CalibrationMethod
+    )
+    onnx_available = True
+except ImportError:
+    onnx_available = False
+
+try:
+    # Optional, out-of-core .tiff reading/writing for images bigger than the RAM budget
+    from tifffile import (
+        imwrite  as tifffile_imwrite,
+        TiffFile,
+        PHOTOMETRIC,
+        PLANARCONFIG
+    )
+    tifffile_available = True
+except ImportError:
+    tifffile_available = False
 
 from PIL.Image import (
+    DecompressionBombError,
     open      as pillow_image_open,
     fromarray as pillow_image_fromarray
 )
@@ -59,36 +124,64 @@ from cv2 import (
     CAP_PROP_FRAME_WIDTH,
     COLOR_BGR2RGB,
     COLOR_GRAY2RGB,
+    COLOR_GRAY2BGR,
     COLOR_BGR2RGBA,
     COLOR_RGB2GRAY,
     IMREAD_UNCHANGED,
+    BORDER_REFLECT_101,
+    BORDER_REPLICATE,
+    WARP_INVERSE_MAP,
     INTER_AREA,
+    INTER_LINEAR,
     VideoCapture as opencv_VideoCapture,
     cvtColor     as opencv_cvtColor,
     imdecode     as opencv_imdecode,
     imencode     as opencv_imencode,
     addWeighted  as opencv_addWeighted,
-    cvtColor     as opencv_cvtColor,
     resize       as opencv_resize,
+    copyMakeBorder as opencv_copyMakeBorder,
+    warpAffine   as opencv_warpAffine,
+    absdiff      as opencv_absdiff,
 )
 
 from numpy import (
     ndarray     as numpy_ndarray,
     frombuffer  as numpy_frombuffer,
     concatenate as numpy_concatenate, 
+    stack       as numpy_stack,
     transpose   as numpy_transpose,
     full        as numpy_full, 
-    zeros       as numpy_zeros, 
-    expand_dims as numpy_expand_dims,
-    squeeze     as numpy_squeeze,
+    empty       as numpy_empty,
+    copyto      as numpy_copyto,
+    ones        as numpy_ones,
+    arange      as numpy_arange,
+    broadcast_to as numpy_broadcast_to,
+    memmap      as numpy_memmap,
+    dtype       as numpy_dtype,
+    load        as numpy_load,
+    save        as numpy_save,
+    hstack      as numpy_hstack,
+    prod        as numpy_prod,
     clip        as numpy_clip,
     mean        as numpy_mean,
-    repeat      as numpy_repeat,
     max         as numpy_max, 
+    min         as numpy_min,
+    sin         as numpy_sin,
+    mgrid       as numpy_mgrid,
+    log10       as numpy_log10,
+    count_nonzero as numpy_count_nonzero,
+    divide      as numpy_divide,
+    multiply    as numpy_multiply,
+    add         as numpy_add,
+    einsum      as numpy_einsum,
+    array       as numpy_array,
+    ascontiguousarray as numpy_ascontiguousarray,
     float32,
     float16,
+    uint16,
     uint8
 )
+from numpy.random import default_rng as numpy_default_rng
 
 # GUI imports
 from tkinter import StringVar
@@ -140,9 +233,10 @@ RealESRGAN_models_list      = [ 'RealESRGANx4', 'RealESRNetx4' ]
 
 
 AI_models_list         = ( SRVGGNetCompact_models_list + AI_LIST_SEPARATOR + RealESRGAN_models_list )
+AI_precision_list      = [ "Auto", "FP32", "FP16", "INT8" ]
 AI_multithreading_list = [ "1 threads", "2 threads", "3 threads", "4 threads", "5 threads", "6 threads"]
 interpolation_list     = [ "Disabled", "Low", "Medium", "High" ]
-gpus_list              = [ "Auto", "GPU 1", "GPU 2", "GPU 3", "GPU 4" ]
+gpus_list              = [ "Auto", "GPU 1", "GPU 2", "GPU 3", "GPU 4", "CPU" ]
 keep_frames_list       = [ "Disabled", "Enabled" ]
 image_extension_list   = [ ".png", ".jpg", ".bmp", ".tiff" ]
 video_extension_list   = [ ".mp4 (x264)", ".mp4 (x265)", ".avi" ]
@@ -152,10 +246,64 @@ DOCUMENT_PATH        = os_path_join(os_path_expanduser('~'), 'Documents')
 USER_PREFERENCE_PATH = find_by_relative_path(f"{DOCUMENT_PATH}{os_separator}{app_name}_UserPreference.json")
 FFMPEG_EXE_PATH      = find_by_relative_path(f"Assets{os_separator}ffmpeg.exe")
 EXIFTOOL_EXE_PATH    = find_by_relative_path(f"Assets{os_separator}exiftool.exe")
+AI_CACHE_PATH        = os_path_join(DOCUMENT_PATH, f"{app_name}_AI_cache")
+AUTOTUNE_PATH        = os_path_join(AI_CACHE_PATH, "autotune.json")
+INT8_CALIBRATION_PATH = os_path_join(AI_CACHE_PATH, "int8_calibration")
+
+BENCHMARK_RUNS = 5
+AUTOTUNE_RUNS  = 2
+AUTOTUNE_MIN_TILE_SIZE = 64
+benchmark_list = [ "precision", "allocations", "int8" ]
 
 ECTRACTION_FRAMES_FOR_CPU = 25
-MULTIPLE_FRAMES_TO_SAVE   = 8
-MULTIPLE_FRAMES_TO_SAVE_MULTITHREAD = MULTIPLE_FRAMES_TO_SAVE/2
+MAX_FRAMES_BATCH          = 16
+MAX_IMAGES_BATCH          = 64
+
+# Held video frames, compared with the last upscaled frame on a HELD_FRAMES_THUMBNAIL_WIDTH px wide copy:
+# max difference <= threshold (0-255) reuses its upscaled output instead of running the AI
+HELD_FRAMES_THUMBNAIL_WIDTH = 128
+HELD_FRAMES_THRESHOLD       = 3
+
+# Static video tiles, frames split in tiles of STATIC_TILES_SIZE px compared with the tiles last upscaled 
+# on STATIC_TILES_THUMBNAIL_SIZE px copies: max difference <= threshold (0-255) reuses the upscaled tile
+STATIC_TILES_SIZE           = 192
+STATIC_TILES_THUMBNAIL_SIZE = 24
+STATIC_TILES_THRESHOLD      = 3
+
+# Upscaled video frames saved by FRAMES_WRITERS_NUMBER threads from a queue of FRAMES_WRITER_QUEUE_SIZE frames
+FRAMES_WRITERS_NUMBER    = 4
+FRAMES_WRITER_QUEUE_SIZE = 16
+
+# Streaming video upscale, frames decoded ➜ upscaled ➜ piped to ffmpeg through queues of STREAMING_QUEUE_FRAMES frames;
+# with the resume journal the video is encoded in segments of STREAMING_SEGMENT_FRAMES frames
+STREAMING_QUEUE_FRAMES   = 16
+STREAMING_SEGMENT_FRAMES = 300
+
+# Upscaled images bigger than the RAM budget are written in a memory-mapped file 
+# and processed/encoded in strips of OUT_OF_CORE_STRIP_BYTES
+OUTPUT_RAM_BUDGET_GB    = 4
+OUT_OF_CORE_STRIP_BYTES = 64 * 1024**2
+OUT_OF_CORE_RESIZE_PERIOD = 256
+
+# Memory-mapped files in the AI cache, the ones of processes no longer running removed on start
+MEMORY_MAPPED_FILES_PREFIXES = [ "canvas", "source" ]
+
+# Highest upscale factor of the AI models, first file decoded while the AI is loading 
+# only if its upscaled image surely fits the RAM budget
+MAX_UPSCALE_FACTOR = 4
+
+# Images with at least TILES_CHECKPOINT_MIN tiles save the upscaled tiles on disk, 
+# an interrupted upscale continues from the last saved tile
+TILES_CHECKPOINT_MIN = 16
+
+GPU_EXECUTION_PROVIDERS = [ 'DmlExecutionProvider', 'CUDAExecutionProvider' ]
+CPU_EXECUTION_PROVIDER  = 'CPUExecutionProvider'
+
+# DirectML does not support concurrent runs on the same session
+SERIAL_RUN_EXECUTION_PROVIDERS = [ 'DmlExecutionProvider' ]
+
+graph_optimization_list = [ "disabled", "basic", "extended", "all" ]
+execution_mode_list     = [ "sequential", "parallel" ]
 
 COMPLETED_STATUS     = "Completed"
 ERROR_STATUS         = "Error"
@@ -163,7 +311,9 @@ STOP_STATUS          = "Stop"
 
 if os_path_exists(FFMPEG_EXE_PATH): 
     print(f"[{app_name}] External ffmpeg.exe file found")
-    os_environ["IMAGEIO_FFMPEG_EXE"] = FFMPEG_EXE_PATH
+elif shutil_which("ffmpeg") != None:
+    print(f"[{app_name}] System ffmpeg found")
+    FFMPEG_EXE_PATH = shutil_which("ffmpeg")
 
 if os_path_exists(USER_PREFERENCE_PATH):
     print(f"[{app_name}] Preference file exist")
@@ -180,6 +330,7 @@ if os_path_exists(USER_PREFERENCE_PATH):
         default_resize_factor     = json_data.get("default_resize_factor",      str(50))
         default_VRAM_limiter      = json_data.get("default_VRAM_limiter",       str(4))
         default_cpu_number        = json_data.get("default_cpu_number",         str(4))
+        default_AI_precision      = json_data.get("default_AI_precision",       AI_precision_list[0])
 else:
     print(f"[{app_name}] Preference file does not exist, using default coded value")
     default_AI_model          = AI_models_list[0]
@@ -193,6 +344,7 @@ else:
     default_resize_factor     = str(50)
     default_VRAM_limiter      = str(4)
     default_cpu_number        = str(4)
+    default_AI_precision      = AI_precision_list[0]
 
 offset_y_options = 0.105
 row0_y = 0.52
@@ -228,6 +380,205 @@ supported_video_extensions = [
 
 # AI -------------------
 
+RGB2GRAY_WEIGHTS = numpy_array([0.299, 0.587, 0.114], dtype = float32)
+
+# Alpha statistics on 1 pixel every ALPHA_SAMPLING_STEP,
+# alpha with less than ALPHA_MASK_MAX_INTERMEDIATE semi-transparent pixels is a simple mask
+ALPHA_SAMPLING_STEP         = 4
+ALPHA_MASK_MAX_INTERMEDIATE = 0.02
+
+# INT8 models calibrated with few small images
+INT8_CALIBRATION_IMAGES     = 8
+INT8_CALIBRATION_RESOLUTION = 128
+
+# Tiles overlap (input pixels) blended with a linear feather to hide tile seams
+TILES_OVERLAP = 32
+
+# Images padded to bucket shapes: each side rounded up to a multiple of 1/4 of its 
+# highest power of two (min SHAPE_BUCKET_MIN_STEP), few shapes for any resolution
+SHAPE_BUCKET_MIN_STEP = 32
+
+# Allocation errors of numpy/onnxruntime providers, the tiles resolution 
+# is halved down to OUT_OF_MEMORY_MIN_RESOLUTION and the input upscaled again
+OUT_OF_MEMORY_MIN_RESOLUTION = 64
+OUT_OF_MEMORY_ERRORS = [ 
+    "failed to allocate", 
+    "bad allocation", 
+    "bad_alloc", 
+    "out of memory", 
+    "e_outofmemory", 
+    "0x8007000e", 
+    "cublas_status_alloc_failed" 
+]
+
+def is_out_of_memory_error(exception: Exception) -> bool:
+    if isinstance(exception, MemoryError): return True
+    exception_message = str(exception).lower()
+    return any(error in exception_message for error in OUT_OF_MEMORY_ERRORS)
+
+@cache
+def get_file_hash(file_path: str, file_modified_time: float) -> str:
+    file_hash = sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""): file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+def convert_model_fp16_to_fp32(fp16_model_path: str, fp32_model_path: str) -> None:
+
+    def convert_tensor(tensor) -> None:
+        if tensor.data_type == TensorProto.FLOAT16:
+            tensor.CopyFrom(numpy_helper.from_array(numpy_helper.to_array(tensor).astype(float32), tensor.name))
+
+    model = onnx_load(fp16_model_path)
+    graph = model.graph
+
+    # Weights
+    for initializer in graph.initializer: convert_tensor(initializer)
+
+    # Cast and Constant nodes
+    for node in graph.node:
+        for attribute in node.attribute:
+            if node.op_type == "Cast" and attribute.name == "to" and attribute.i == TensorProto.FLOAT16:
+                attribute.i = TensorProto.FLOAT
+            elif attribute.HasField("t"):
+                convert_tensor(attribute.t)
+
+    # Inputs, outputs and intermediate values types
+    for value_info in list(graph.input) + list(graph.output) + list(graph.value_info):
+        if value_info.type.tensor_type.elem_type == TensorProto.FLOAT16:
+            value_info.type.tensor_type.elem_type = TensorProto.FLOAT
+
+    onnx_save(model, fp32_model_path)
+
+def get_int8_calibration_images() -> list[numpy_ndarray]:
+    
+    # Images in INT8_CALIBRATION_PATH if any, else synthetic images with gradients, 
+    # edges, textures and noise covering the activations range of natural images
+    calibration_images = []
+
+    if os_path_exists(INT8_CALIBRATION_PATH):
+        for file_name in sorted(os_listdir(INT8_CALIBRATION_PATH))[:INT8_CALIBRATION_IMAGES]:
+            image = image_read(os_path_join(INT8_CALIBRATION_PATH, file_name))
+            if image is None or image.dtype != uint8: continue
+            if image.ndim == 2:     image = opencv_cvtColor(image, COLOR_GRAY2RGB)
+            if image.shape[2] == 4: image = image[:, :, :3]
+            calibration_images.append(opencv_resize(image, (INT8_CALIBRATION_RESOLUTION, INT8_CALIBRATION_RESOLUTION), interpolation = INTER_AREA))
+
+    if len(calibration_images) > 0: return calibration_images
+
+    random_generator = numpy_default_rng(0)
+    size = INT8_CALIBRATION_RESOLUTION
+    y, x = numpy_mgrid[0:size, 0:size].astype(float32) / size
+
+    for image_index in range(INT8_CALIBRATION_IMAGES):
+        frequency  = 2 + 6 * image_index
+        channels   = [
+            0.5 + 0.5 * numpy_sin(frequency * x + image_index),
+            y,
+            (x + y) / 2 + 0.5 * (random_generator.random((size, size), dtype = float32) - 0.5) * (image_index / INT8_CALIBRATION_IMAGES),
+        ]
+        image = numpy_stack(channels, axis = 2)
+
+        # Hard edges
+        y_start, x_start = random_generator.integers(0, size // 2, 2)
+        image[y_start:y_start + size // 3, x_start:x_start + size // 3] = random_generator.random(3)
+
+        calibration_images.append((numpy_clip(image, 0, 1) * 255).astype(uint8))
+
+    return calibration_images
+
+def quantize_model_int8(fp32_model_path: str, int8_model_path: str) -> None:
+
+    class CalibrationImagesReader:
+        def __init__(self, input_name: str, images: list[numpy_ndarray]):
+            self.inputs = iter([{ input_name: numpy_transpose(image.astype(float32) / 255, (2, 0, 1))[None] } for image in images])
+        
+        def get_next(self) -> dict | None:
+            return next(self.inputs, None)
+
+    # Static QDQ quantization: int8 weights (per channel), uint8 activations calibrated with MinMax
+    input_name = onnx_load(fp32_model_path).graph.input[0].name
+
+    quantize_static(
+        fp32_model_path,
+        int8_model_path,
+        CalibrationImagesReader(input_name, get_int8_calibration_images()),
+        quant_format      = QuantFormat.QDQ,
+        per_channel       = True,
+        activation_type   = QuantType.QUInt8,
+        weight_type       = QuantType.QInt8,
+        calibrate_method  = CalibrationMethod.MinMax
+    )
+
+def wrap_model_uint8_io(model_path: str, wrapped_model_path: str) -> None:
+
+    # Pre/post-processing inside the graph:
+    # uint8 NHWC image ➜ float NCHW [0, 1] ➜ AI model ➜ clip [0, 1] ➜ uint8 NHWC image
+    model = onnx_load(model_path)
+    graph = model.graph
+
+    model_input  = graph.input[0]
+    model_output = graph.output[0]
+    input_type   = model_input.type.tensor_type.elem_type
+    output_type  = model_output.type.tensor_type.elem_type
+    batch_dimension = model_input.type.tensor_type.shape.dim[0]
+    batch_dimension = batch_dimension.dim_value if batch_dimension.HasField("dim_value") else "batch"
+    opset_version   = next(opset.version for opset in model.opset_import if opset.domain in ("", "ai.onnx"))
+
+    preprocess_nodes = [
+        onnx_helper.make_node("Cast",      ["image_uint8"],       ["image_float"],       to = TensorProto.FLOAT),
+        onnx_helper.make_node("Div",       ["image_float", "uint8_range"], ["image_normalized"]),
+        onnx_helper.make_node("Transpose", ["image_normalized"],  ["image_nchw"],        perm = [0, 3, 1, 2]),
+        onnx_helper.make_node("Cast",      ["image_nchw"],        [model_input.name],    to = input_type),
+    ]
+
+    if opset_version >= 11:
+        clip_node = onnx_helper.make_node("Clip", ["output_float", "clip_min", "clip_max"], ["output_clipped"])
+    else:
+        clip_node = onnx_helper.make_node("Clip", ["output_float"], ["output_clipped"], min = 0.0, max = 1.0)
+
+    postprocess_nodes = [
+        onnx_helper.make_node("Cast",      [model_output.name],   ["output_float"],      to = TensorProto.FLOAT),
+        clip_node,
+        onnx_helper.make_node("Mul",       ["output_clipped", "uint8_range"], ["output_denormalized"]),
+        onnx_helper.make_node("Transpose", ["output_denormalized"], ["output_nhwc"],     perm = [0, 2, 3, 1]),
+        onnx_helper.make_node("Cast",      ["output_nhwc"],       ["output_uint8"],      to = TensorProto.UINT8),
+    ]
+
+    graph.initializer.extend([
+        numpy_helper.from_array(numpy_full((), 255, dtype = float32), "uint8_range"),
+        numpy_helper.from_array(numpy_full((), 0,   dtype = float32), "clip_min"),
+        numpy_helper.from_array(numpy_full((), 1,   dtype = float32), "clip_max"),
+    ])
+
+    model_nodes = list(graph.node)
+    del graph.node[:]
+    graph.node.extend(preprocess_nodes + model_nodes + postprocess_nodes)
+
+    del graph.input[:]
+    del graph.output[:]
+    graph.input.append(onnx_helper.make_tensor_value_info("image_uint8",   TensorProto.UINT8, [batch_dimension, "height", "width", 3]))
+    graph.output.append(onnx_helper.make_tensor_value_info("output_uint8", TensorProto.UINT8, [batch_dimension, "upscaled_height", "upscaled_width", 3]))
+
+    onnx_save(model, wrapped_model_path)
+
+def get_default_session_settings(execution_provider: str, cpu_number: int) -> dict:
+
+    # DirectML does not support memory pattern and parallel execution
+    # GPU providers do not need CPU threads for the kernels
+    match execution_provider:
+        case 'CPUExecutionProvider': intra_op_threads = cpu_number
+        case _:                      intra_op_threads = 0
+
+    return {
+        "graph_optimization_level": "all",
+        "execution_mode":           "sequential",
+        "intra_op_threads":         intra_op_threads,
+        "inter_op_threads":         1,
+        "memory_pattern":           execution_provider != 'DmlExecutionProvider',
+        "cpu_arena":                True,
+    }
+
 class AI:
 
     # CLASS INIT FUNCTIONS
@@ -235,46 +586,282 @@ class AI:
     def __init__(
             self, 
             AI_model_name: str, 
-            directml_gpu: str, 
+            selected_gpu: str, 
             resize_factor: int,
-            max_resolution: int
+            max_resolution: int,
+            cpu_number: int = 1,
+            session_settings: dict = None,
+            AI_precision: str = "Auto",
+            tile_size: int = None,
+            tiles_workers: int = 1,
+            output_ram_budget: float = OUTPUT_RAM_BUDGET_GB
             ):
         
         # Passed variables
         self.AI_model_name  = AI_model_name
-        self.directml_gpu   = directml_gpu
+        self.selected_gpu   = selected_gpu
         self.resize_factor  = resize_factor
         self.max_resolution = max_resolution
+        self.cpu_number     = cpu_number
+        self.set_tiles_settings(tile_size or max_resolution, tiles_workers)
+        self.output_memory_limit = int(output_ram_budget * 1024**3)
 
         # Calculated variables
-        self.AI_model_path    = find_by_relative_path(f"AI-onnx{os_separator}{self.AI_model_name}_fp16.onnx")
         self.upscale_factor   = self._get_upscale_factor()
-        self.inferenceSession = self._load_inferenceSession()
+        self.execution_provider, self.provider_options = self._get_execution_provider()
+        self.AI_precision     = self._get_AI_precision(AI_precision)
+        self.AI_model_path    = self._get_AI_model_path()
+        self.session_settings = get_default_session_settings(self.execution_provider, cpu_number) | (session_settings or {})
+        self.session_start_time = timer()
+
+        # Model with pre/post-processing inside the graph for 8 bit images, 
+        # model without it only loaded for 16 bit images
+        self.uint8_model_path = self._get_uint8_model_path()
+        self.uint8_io         = self.uint8_model_path != None
+        self.inferenceSession = self._load_inferenceSession(self.uint8_model_path if self.uint8_io else self.AI_model_path)
+        self.float_inferenceSession = None if self.uint8_io else self.inferenceSession
+        self.float_session_lock     = Lock()
+        self.first_frame_done = False
+        self.batch_supported  = self._check_batch_support()
+
+        # Session shared by the worker threads, each thread has its own inference buffers
+        # reused while the input shape does not change and the tiles resolution is not reduced
+        self.inference_buffers = threading_local()
+        self.inference_buffers_generation = 0
+        self.inference_lock    = Lock() if self.execution_provider in SERIAL_RUN_EXECUTION_PROVIDERS else None
+
+        # Sessions of the same pool reduce their tiles resolution together after an out of memory error
+        self.pooled_sessions    = [self]
+        self.out_of_memory_lock = Lock()
 
     def _get_upscale_factor(self) -> int:
         if   "x1" in self.AI_model_name: return 1
         elif "x2" in self.AI_model_name: return 2
         elif "x4" in self.AI_model_name: return 4
 
-    def _load_inferenceSession(self) -> InferenceSession:
-        
-        providers = ['DmlExecutionProvider']
-
-        match self.directml_gpu:
-            case 'Auto':        provider_options = [{"performance_preference": "high_performance"}]
-            case 'GPU 1':       provider_options = [{"device_id": "0"}]
-            case 'GPU 2':       provider_options = [{"device_id": "1"}]
-            case 'GPU 3':       provider_options = [{"device_id": "2"}]
-            case 'GPU 4':       provider_options = [{"device_id": "3"}]
-
-        inference_session = InferenceSession(
-            path_or_bytes    = self.AI_model_path, 
-            providers        = providers,
-            provider_options = provider_options
-            )
+    def _get_execution_provider(self) -> tuple:
+        available_providers = get_available_providers()
+        gpu_providers       = [provider for provider in GPU_EXECUTION_PROVIDERS if provider in available_providers]
+
+        if self.selected_gpu == 'CPU' or len(gpu_providers) == 0:
+            return CPU_EXECUTION_PROVIDER, {}
+
+        execution_provider = gpu_providers[0]
+
+        match self.selected_gpu:
+            case 'Auto':  device_id = None
+            case 'GPU 1': device_id = "0"
+            case 'GPU 2': device_id = "1"
+            case 'GPU 3': device_id = "2"
+            case 'GPU 4': device_id = "3"
+
+        match execution_provider:
+            case 'DmlExecutionProvider' if device_id == None: provider_options = {"performance_preference": "high_performance"}
+            case 'DmlExecutionProvider':                      provider_options = {"device_id": device_id}
+            case 'CUDAExecutionProvider':                     provider_options = {"device_id": device_id or "0"}
+
+        return execution_provider, provider_options
+
+    def _get_AI_precision(self, AI_precision: str) -> str:
+        # fp16 graphs on CPU run on slow kernels or with Cast nodes everywhere
+        match AI_precision:
+            case "FP32": return "fp32"
+            case "FP16": return "fp16"
+            case "INT8": return "int8"
+            case _:      return "fp32" if self.execution_provider == CPU_EXECUTION_PROVIDER else "fp16"
+
+    def _get_AI_model_path(self) -> str:
+        fp16_model_path = find_by_relative_path(f"AI-onnx{os_separator}{self.AI_model_name}_fp16.onnx")
+
+        match self.AI_precision:
+            case "fp16": return fp16_model_path
+            case "int8": return self._get_int8_model_path(fp16_model_path)
+            case _:      return self._get_fp32_model_path(fp16_model_path)
+
+    def _get_fp32_model_path(self, fp16_model_path: str) -> str:
+        # fp32 model distributed with the app OR generated from the fp16 model and cached
+        fp32_model_path = find_by_relative_path(f"AI-onnx{os_separator}{self.AI_model_name}_fp32.onnx")
+        if os_path_exists(fp32_model_path): return fp32_model_path
+
+        if not onnx_available:
+            print(f" {self.AI_model_name} fp32 model not available (onnx not installed), using fp16")
+            self.AI_precision = "fp16"
+            return fp16_model_path
+
+        model_hash             = get_file_hash(fp16_model_path, os_stat(fp16_model_path).st_mtime)
+        cached_fp32_model_path = os_path_join(AI_CACHE_PATH, f"{self.AI_model_name}_fp32_{model_hash[:16]}.onnx")
+
+        if os_path_exists(cached_fp32_model_path): return cached_fp32_model_path
+
+        print(f" Generating {self.AI_model_name} fp32 model")
+        temporary_model_path = f"{cached_fp32_model_path}.{os_getpid()}_{threading_get_ident()}.tmp"
+        try:
+            os_makedirs(AI_CACHE_PATH, exist_ok = True)
+            convert_model_fp16_to_fp32(fp16_model_path, temporary_model_path)
+            os_replace(temporary_model_path, cached_fp32_model_path)
+            return cached_fp32_model_path
+        except Exception as exception:
+            print(f" {self.AI_model_name} model not convertible to fp32: {exception}, using fp16")
+            if os_path_exists(temporary_model_path): os_remove(temporary_model_path)
+            self.AI_precision = "fp16"
+            return fp16_model_path
+
+    def _get_int8_model_path(self, fp16_model_path: str) -> str:
+        if not onnx_available:
+            print(f" {self.AI_model_name} int8 model not available (onnx not installed), using fp32")
+            self.AI_precision = "fp32"
+            return self._get_fp32_model_path(fp16_model_path)
+
+        # Quantized from the fp32 model and cached
+        fp32_model_path = self._get_fp32_model_path(fp16_model_path)
+        if self.AI_precision == "fp16": return fp16_model_path
+
+        model_hash      = get_file_hash(fp32_model_path, os_stat(fp32_model_path).st_mtime)
+        int8_model_path = os_path_join(AI_CACHE_PATH, f"{self.AI_model_name}_int8_{model_hash[:16]}.onnx")
+
+        if os_path_exists(int8_model_path): return int8_model_path
+
+        print(f" Generating {self.AI_model_name} int8 model")
+        temporary_model_path = f"{int8_model_path}.{os_getpid()}_{threading_get_ident()}.tmp"
+        try:
+            quantize_model_int8(fp32_model_path, temporary_model_path)
+            os_replace(temporary_model_path, int8_model_path)
+            return int8_model_path
+        except Exception as exception:
+            print(f" {self.AI_model_name} model not quantizable: {exception}, using fp32")
+            if os_path_exists(temporary_model_path): os_remove(temporary_model_path)
+            self.AI_precision = "fp32"
+            return fp32_model_path
+
+    def _get_uint8_model_path(self) -> str | None:
+        if not onnx_available: return None
+
+        model_hash       = get_file_hash(self.AI_model_path, os_stat(self.AI_model_path).st_mtime)
+        uint8_model_path = os_path_join(AI_CACHE_PATH, f"{self.AI_model_name}_{self.AI_precision}_uint8_{model_hash[:16]}.onnx")
+
+        if os_path_exists(uint8_model_path): return uint8_model_path
+
+        # Some graphs can not be wrapped, the NumPy pre/post-processing is used for them
+        temporary_model_path = f"{uint8_model_path}.{os_getpid()}_{threading_get_ident()}.tmp"
+        try:
+            os_makedirs(AI_CACHE_PATH, exist_ok = True)
+            wrap_model_uint8_io(self.AI_model_path, temporary_model_path)
+            os_replace(temporary_model_path, uint8_model_path)
+            return uint8_model_path
+        except Exception as exception:
+            print(f" {self.AI_model_name} model not wrappable with uint8 input/output: {exception}")
+            if os_path_exists(temporary_model_path): os_remove(temporary_model_path)
+            return None
+
+    def _get_session_options(self) -> SessionOptions:
+        settings        = self.session_settings
+        session_options = SessionOptions()
+
+        match settings["graph_optimization_level"]:
+            case "disabled": session_options.graph_optimization_level = GraphOptimizationLevel.ORT_DISABLE_ALL
+            case "basic":    session_options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_BASIC
+            case "extended": session_options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+            case "all":      session_options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        match settings["execution_mode"]:
+            case "sequential": session_options.execution_mode = ExecutionMode.ORT_SEQUENTIAL
+            case "parallel":   session_options.execution_mode = ExecutionMode.ORT_PARALLEL
+
+        session_options.intra_op_num_threads = settings["intra_op_threads"]
+        session_options.inter_op_num_threads = settings["inter_op_threads"]
+        session_options.enable_mem_pattern   = settings["memory_pattern"]
+        session_options.enable_cpu_mem_arena = settings["cpu_arena"]
+
+        return session_options
+
+    def _get_optimized_model_path(self, model_path: str) -> str:
+        # Optimized graph depends on model file, execution provider, session options, 
+        # onnxruntime version and CPU (AI_CACHE_PATH can be synced with other machines)
+        model_hash = get_file_hash(model_path, os_stat(model_path).st_mtime)
+        cache_key  = json_dumps([
+            model_hash, 
+            self.execution_provider, 
+            self.provider_options, 
+            self.session_settings, 
+            onnxruntime_version, 
+            platform_machine(), 
+            platform_processor()
+        ], sort_keys = True)
+        cache_hash = sha256(cache_key.encode()).hexdigest()[:16]
+        model_name = os_path_splitext(os_path_basename(model_path))[0]
+
+        return os_path_join(AI_CACHE_PATH, f"{model_name}_{cache_hash}.ort")
+
+    def _load_inferenceSession(self, model_path: str) -> InferenceSession:
+
+        if self.execution_provider == CPU_EXECUTION_PROVIDER:
+            providers        = [CPU_EXECUTION_PROVIDER]
+            provider_options = [{}]
+        else:
+            # CPU provider as fallback for nodes not supported by the GPU provider
+            providers        = [self.execution_provider, CPU_EXECUTION_PROVIDER]
+            provider_options = [self.provider_options, {}]
+
+        print(f" Execution provider: {self.execution_provider} {self.provider_options}")
+
+        start_timer          = timer()
+        optimized_model_path = self._get_optimized_model_path(model_path)
+
+        try:
+            if os_path_exists(optimized_model_path):
+                # Graph already optimized up to the extended level, only the hardware specific 
+                # optimizations of the "all" level (if selected) applied on load
+                session_options = self._get_session_options()
+                if session_options.graph_optimization_level != GraphOptimizationLevel.ORT_ENABLE_ALL:
+                    session_options.graph_optimization_level = GraphOptimizationLevel.ORT_DISABLE_ALL
+                inference_session = InferenceSession(optimized_model_path, session_options, providers, provider_options)
+                print(f" Session loaded from optimized model cache in {timer() - start_timer:.2f}s")
+                return inference_session
+        except Exception as exception:
+            print(f" Optimized model cache not loadable, rebuilding it: {exception}")
+
+        # Saved to a temporary file first, other AI instances can be loading the same model
+        temporary_model_path = f"{optimized_model_path}.{os_getpid()}_{threading_get_ident()}.tmp"
+
+        try:
+            os_makedirs(AI_CACHE_PATH, exist_ok = True)
+            # Saved graph without hardware specific optimizations (level capped to extended)
+            session_options = self._get_session_options()
+            if session_options.graph_optimization_level == GraphOptimizationLevel.ORT_ENABLE_ALL:
+                session_options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+            session_options.optimized_model_filepath = temporary_model_path
+            session_options.add_session_config_entry("session.save_model_format", "ORT")
+            inference_session = InferenceSession(model_path, session_options, providers, provider_options)
+            os_replace(temporary_model_path, optimized_model_path)
+        except Exception as exception:
+            # Execution providers with compiled nodes can not save the optimized model
+            print(f" Optimized model cache not available: {exception}")
+            if os_path_exists(temporary_model_path): os_remove(temporary_model_path)
+            inference_session = InferenceSession(model_path, self._get_session_options(), providers, provider_options)
+
+        print(f" Session loaded and optimized in {timer() - start_timer:.2f}s")
 
         return inference_session
 
+    def get_float_inferenceSession(self) -> InferenceSession:
+        with self.float_session_lock:
+            if self.float_inferenceSession == None:
+                print(f" Loading {self.AI_model_name} model with float input/output")
+                self.float_inferenceSession = self._load_inferenceSession(self.AI_model_path)
+
+        return self.float_inferenceSession
+
+    def _check_batch_support(self) -> bool:
+        # Models exported with a fixed batch dimension accept only 1 image for each run
+        batch_dimension = self.inferenceSession.get_inputs()[0].shape[0]
+        return not isinstance(batch_dimension, int)
+
+    def _get_tensor_dtype(self, tensor_type: str) -> type:
+        match tensor_type:
+            case "tensor(uint8)":   return uint8
+            case "tensor(float16)": return float16
+            case _:                 return float32
+
 
 
     # INTERNAL CLASS FUNCTIONS
@@ -336,8 +923,12 @@ class AI:
 
     # VIDEO CLASS FUNCTIONS
 
-    def calculate_multiframes_supported_by_gpu(self, video_frame_path: str) -> int:
-        resized_video_frame  = self.resize_image_with_resize_factor(image_read(video_frame_path))
+    def get_video_frame(self, video_frame: str | numpy_ndarray) -> numpy_ndarray:
+        # Frame extracted on disk or decoded in memory (streaming)
+        return image_read(video_frame) if isinstance(video_frame, str) else video_frame
+
+    def calculate_multiframes_supported_by_gpu(self, video_frame: str | numpy_ndarray) -> int:
+        resized_video_frame  = self.resize_image_with_resize_factor(self.get_video_frame(video_frame))
         height, width        = self.get_image_resolution(resized_video_frame)
         image_pixels         = height * width
         max_supported_pixels = self.max_resolution * self.max_resolution
@@ -348,10 +939,20 @@ class AI:
 
         return frames_simultaneously
 
+    def calculate_frames_batch_size(self, video_frame: str | numpy_ndarray) -> int:
+        if not self.batch_supported: return 1
+
+        frames_batch_size = min(self.calculate_multiframes_supported_by_gpu(video_frame), MAX_FRAMES_BATCH)
+        frames_batch_size = max(frames_batch_size, 1)
+
+        print(f" Frames batch size: {frames_batch_size}")
+
+        return frames_batch_size
+
     # TILLING FUNCTIONS
 
-    def video_need_tilling(self, video_frame_path: str) -> bool:       
-        resized_video_frame  = self.resize_image_with_resize_factor(image_read(video_frame_path))
+    def video_need_tilling(self, video_frame: str | numpy_ndarray) -> bool:       
+        resized_video_frame  = self.resize_image_with_resize_factor(self.get_video_frame(video_frame))
         height, width        = self.get_image_resolution(resized_video_frame)
         image_pixels         = height * width
         max_supported_pixels = self.max_resolution * self.max_resolution
@@ -361,6 +962,52 @@ class AI:
         else:
             return False
 
+    def calculate_bucket_size(self, size: int) -> int:
+        bucket_step = max(SHAPE_BUCKET_MIN_STEP, (1 << (size.bit_length() - 1)) // 4)
+        return (size + bucket_step - 1) // bucket_step * bucket_step
+
+    def calculate_bucket_resolution(self, image: numpy_ndarray) -> tuple:
+        height, width = self.get_image_resolution(image)
+        return self.calculate_bucket_size(height), self.calculate_bucket_size(width)
+
+    def calculate_images_batch_size(self, bucket_resolution: tuple) -> int:
+        bucket_height, bucket_width = bucket_resolution
+        images_batch_size = (self.max_resolution * self.max_resolution) // (bucket_height * bucket_width)
+
+        return min(images_batch_size, MAX_IMAGES_BATCH)
+
+    def image_fits_images_batch(self, height: int, width: int) -> bool:
+        # At least two images of this bucket shape in one session run
+        if not self.batch_supported: return False
+
+        resized_height = int(height * self.resize_factor)
+        resized_width  = int(width  * self.resize_factor)
+        if resized_height < 1 or resized_width < 1: return False
+
+        bucket_resolution = (self.calculate_bucket_size(resized_height), self.calculate_bucket_size(resized_width))
+
+        return self.calculate_images_batch_size(bucket_resolution) >= 2
+
+    def calculate_warmup_shape(self, height: int, width: int, is_video: bool) -> tuple:
+        # Inference shape of the first file (batch, height, width, tiled): 
+        # tiles batch, video frames batch or image bucket
+        resized_height = max(int(height * self.resize_factor), 1)
+        resized_width  = max(int(width  * self.resize_factor), 1)
+        image_pixels   = resized_height * resized_width
+        max_pixels     = self.max_resolution * self.max_resolution
+
+        if image_pixels > max_pixels:
+            tiles_number     = len(self.calculate_axis_tiles_positions(resized_height)) * len(self.calculate_axis_tiles_positions(resized_width))
+            batches_number   = math_ceil(tiles_number / self.calculate_tiles_batch_size())
+            tiles_batch_size = math_ceil(tiles_number / batches_number)
+            tiles_batch_size = tiles_batch_size if self.batch_supported else 1
+            return tiles_batch_size, self.tile_size, self.tile_size, True
+        elif is_video:
+            frames_batch_size = min(max(max_pixels // image_pixels, 1), MAX_FRAMES_BATCH) if self.batch_supported else 1
+            return frames_batch_size, resized_height, resized_width, False
+        else:
+            return 1, self.calculate_bucket_size(resized_height), self.calculate_bucket_size(resized_width), False
+
     def image_need_tilling(self, image: numpy_ndarray) -> bool:
         height, width = self.get_image_resolution(image)
         image_pixels  = height * width
@@ -371,201 +1018,769 @@ class AI:
         else:
             return False
 
-    def add_alpha_channel(self, image: numpy_ndarray) -> numpy_ndarray:
-        if image.shape[2] == 3:
-            alpha = numpy_full((image.shape[0], image.shape[1], 1), 255, dtype = uint8)
-            image = numpy_concatenate((image, alpha), axis = 2)
-        return image
+    def calculate_axis_tiles_positions(self, axis_size: int, tile_size: int = None) -> list[int]:
+        tile_size = tile_size or self.tile_size
 
-    def calculate_tiles_number(
-            self, 
-            image: numpy_ndarray, 
-            ) -> tuple:
-        
+        if axis_size <= tile_size:
+            return [0]
+
+        step        = tile_size - self.tiles_overlap
+        tiles_count = (axis_size - self.tiles_overlap + step - 1) // step
+
+        # Last tile is aligned to the image border, no remainder pixels dropped
+        return [min(index * step, axis_size - tile_size) for index in range(tiles_count)]
+
+    def calculate_tiles_positions(self, image: numpy_ndarray, tile_size: int = None) -> list[tuple]:
         height, width = self.get_image_resolution(image)
 
-        tiles_x = (width  + self.max_resolution - 1) // self.max_resolution
-        tiles_y = (height + self.max_resolution - 1) // self.max_resolution
+        positions_y = self.calculate_axis_tiles_positions(height, tile_size)
+        positions_x = self.calculate_axis_tiles_positions(width, tile_size)
+
+        return [(y_start, x_start) for y_start in positions_y for x_start in positions_x]
 
-        return tiles_x, tiles_y
-    
     def split_image_into_tiles(
             self,
             image: numpy_ndarray, 
-            tiles_x: int, 
-            tiles_y: int
+            tiles_positions: list[tuple],
+            tile_size: int = None
             ) -> list[numpy_ndarray]:
 
-        img_height, img_width = self.get_image_resolution(image)
+        tile_size = tile_size or self.tile_size
+        tiles     = []
 
-        tile_width  = img_width // tiles_x
-        tile_height = img_height // tiles_y
+        for y_start, x_start in tiles_positions:
+            tile = image[y_start:y_start + tile_size, x_start:x_start + tile_size]
 
-        tiles = []
+            # Images smaller than a tile on one axis, pad by reflection 
+            # so every inference runs on the same tile shape
+            tile_height, tile_width = self.get_image_resolution(tile)
+            if tile_height < tile_size or tile_width < tile_size:
+                tile = opencv_copyMakeBorder(tile, 0, tile_size - tile_height, 0, tile_size - tile_width, BORDER_REFLECT_101)
 
-        for y in range(tiles_y):
-            y_start = y * tile_height
-            y_end   = (y + 1) * tile_height
-
-            for x in range(tiles_x):
-                x_start = x * tile_width
-                x_end   = (x + 1) * tile_width
-                tile    = image[y_start:y_end, x_start:x_end]
-                tiles.append(tile)
+            tiles.append(tile)
 
         return tiles
 
-    def combine_tiles_into_image(
+    def calculate_axis_tiles_overlaps(self, axis_positions: list[int], tile_size: int = None) -> dict:
+        tile_size = tile_size or self.tile_size
+        overlaps  = { axis_positions[0]: 0 }
+        for previous_start, start in zip(axis_positions, axis_positions[1:]):
+            overlaps[start] = max(0, previous_start + tile_size - start)
+        return overlaps
+
+    def calculate_feather_weights(self, overlap: int, length: int) -> numpy_ndarray:
+        weights = numpy_ones(length, dtype = float32)
+        weights[:overlap] = (numpy_arange(overlap, dtype = float32) + 0.5) / overlap
+        return weights
+
+    def blend_tile_region(
             self,
-            image: numpy_ndarray,
-            tiles: list[numpy_ndarray], 
-            t_height: int, 
-            t_width: int,
-            num_tiles_x: int, 
-            ) -> numpy_ndarray:
+            canvas_region: numpy_ndarray,
+            tile_region: numpy_ndarray,
+            weights: numpy_ndarray
+            ) -> None:
 
-        match self.get_image_mode(image):
-            case "Grayscale": tiled_image = numpy_zeros((t_height, t_width, 3), dtype = uint8)
-            case "RGB":       tiled_image = numpy_zeros((t_height, t_width, 3), dtype = uint8)
-            case "RGBA":      tiled_image = numpy_zeros((t_height, t_width, 4), dtype = uint8)
+        # canvas = canvas * (1 - w) + tile * w, only on the overlap strip
+        weights = weights[:, :, None]
+        blended = canvas_region.astype(float32)
+        blended += (tile_region.astype(float32) - blended) * weights
+        blended += 0.5
+        numpy_copyto(canvas_region, blended, casting = "unsafe")
+
+    def set_tiles_settings(self, tile_size: int, tiles_workers: int) -> None:
+        self.tile_size     = min(tile_size, self.max_resolution)
+        self.tiles_overlap = min(TILES_OVERLAP, self.tile_size // 4)
+
+        # Tiles batches upscaled inline with 1 worker, otherwise by the same worker threads 
+        # for every image (their inference buffers reused from one image to the next)
+        tiles_workers = max(tiles_workers, 1)
+        if tiles_workers != getattr(self, "tiles_workers", None):
+            self.close_tiles_pool()
+            self.tiles_pool = ThreadPool(tiles_workers) if tiles_workers > 1 else None
+        self.tiles_workers = tiles_workers
+
+    def close_tiles_pool(self) -> None:
+        tiles_pool = getattr(self, "tiles_pool", None)
+        if tiles_pool != None:
+            tiles_pool.close()
+            tiles_pool.join()
+        self.tiles_pool = None
+
+    def calculate_tiles_batch_size(self, tile_size: int = None) -> int:
+        if not self.batch_supported: return 1
+
+        # Without the inference lock every worker runs its batch at the same time
+        tile_size          = tile_size or self.tile_size
+        concurrent_runs    = 1 if self.inference_lock != None else self.tiles_workers
+        tiles_batch_size   = (self.max_resolution * self.max_resolution) // (tile_size * tile_size * concurrent_runs)
+
+        return min(max(tiles_batch_size, 1), MAX_FRAMES_BATCH)
+
+    def upscale_tiles(self, tiles: list[numpy_ndarray], tiles_batch_size: int = 0) -> list[numpy_ndarray]:
+        # Grayscale tiles upscaled as RGB, same output and batchable
+        tiles = [opencv_cvtColor(tile, COLOR_GRAY2RGB) if tile.ndim == 2 else tile for tile in tiles]
+        tiles_batch_size = max(tiles_batch_size, len(tiles))
+
+        # Same shape RGB tiles in one session run, RGBA tiles one by one (alpha mode of each tile)
+        # Last batch padded to the size of the others, a single input shape bound for all the batches
+        if tiles_batch_size > 1 and self.get_image_mode(tiles[0]) == "RGB":
+            padded_tiles = tiles + [tiles[-1]] * (tiles_batch_size - len(tiles))
+            return self.AI_upscale_batch(padded_tiles)[:len(tiles)]
+        else:
+            return [self.AI_upscale(tile) for tile in tiles]
 
-        for tile_index in range(len(tiles)):
-            actual_tile = tiles[tile_index]
+    def write_tile_into_image(
+            self,
+            tiled_image: numpy_ndarray,
+            tile: numpy_ndarray,
+            y_start: int,
+            x_start: int,
+            overlap_y: int,
+            overlap_x: int,
+            tile_size: int = None
+            ) -> None:
 
-            tile_height, tile_width = self.get_image_resolution(actual_tile)
+        # Tiles written in raster order, overlap strips blended with the previous tiles
+        height, width = tiled_image.shape[0] // self.upscale_factor, tiled_image.shape[1] // self.upscale_factor
+        factor        = self.upscale_factor
+        tile_size     = tile_size or self.tile_size
 
-            row     = tile_index // num_tiles_x
-            col     = tile_index % num_tiles_x
-            y_start = row * tile_height
-            y_end   = y_start + tile_height
-            x_start = col * tile_width
-            x_end   = x_start + tile_width
+        y_end     = min(y_start + tile_size, height)
+        x_end     = min(x_start + tile_size, width)
+        overlap_y = min(overlap_y, y_end - y_start)
+        overlap_x = min(overlap_x, x_end - x_start)
 
-            match self.get_image_mode(image):
-                case "Grayscale": tiled_image[y_start:y_end, x_start:x_end] = actual_tile
-                case "RGB":       tiled_image[y_start:y_end, x_start:x_end] = actual_tile
-                case "RGBA":      tiled_image[y_start:y_end, x_start:x_end] = self.add_alpha_channel(actual_tile)
+        out_y_start, out_y_end = y_start * factor, y_end * factor
+        out_x_start, out_x_end = x_start * factor, x_end * factor
+        out_overlap_y, out_overlap_x = overlap_y * factor, overlap_x * factor
 
-        return tiled_image
+        tile = tile[:out_y_end - out_y_start, :out_x_end - out_x_start]
+
+        # Region not covered by previous tiles is copied as is
+        tiled_image[out_y_start + out_overlap_y:out_y_end, out_x_start + out_overlap_x:out_x_end] = tile[out_overlap_y:, out_overlap_x:]
+
+        weights_x = self.calculate_feather_weights(out_overlap_x, out_x_end - out_x_start)
+
+        if out_overlap_y > 0:
+            weights_y = self.calculate_feather_weights(out_overlap_y, out_overlap_y)
+            self.blend_tile_region(
+                tiled_image[out_y_start:out_y_start + out_overlap_y, out_x_start:out_x_end],
+                tile[:out_overlap_y],
+                weights_y[:, None] * weights_x[None, :]
+            )
+
+        if out_overlap_x > 0:
+            strip_height = out_y_end - out_y_start - out_overlap_y
+            self.blend_tile_region(
+                tiled_image[out_y_start + out_overlap_y:out_y_end, out_x_start:out_x_start + out_overlap_x],
+                tile[out_overlap_y:, :out_overlap_x],
+                numpy_broadcast_to(weights_x[:out_overlap_x], (strip_height, out_overlap_x))
+            )
 
 
 
     # AI CLASS FUNCTIONS
 
-    def normalize_image(self, image: numpy_ndarray) -> tuple:
-        range = 255
-        if numpy_max(image) > 256: range = 65535
-        normalized_image = image / range
+    def get_image_range(self, image: numpy_ndarray) -> int:
+        # Bit depth from dtype, full image scan only for not integer images
+        if   image.dtype == uint8:  return 255
+        elif image.dtype == uint16: return 65535
+        elif numpy_max(image) > 256: return 65535
+        else: return 255
 
-        return normalized_image, range
-    
-    def preprocess_image(self, image: numpy_ndarray) -> numpy_ndarray:
-        image = numpy_transpose(image, (2, 0, 1))
-        image = numpy_expand_dims(image, axis=0)
+    def preprocess_image(
+            self, 
+            image: numpy_ndarray, 
+            range: int, 
+            input_buffer: numpy_ndarray
+            ) -> None:
+        
+        # HWC ➜ CHW and [0, range] ➜ [0, 1] in one pass, written in the inference input buffer
+        # Grayscale/alpha HW images are broadcasted on the 3 channels
+        if image.ndim == 3: image = numpy_transpose(image, (2, 0, 1))
+        numpy_divide(image, range, out = input_buffer, dtype = float32, casting = "unsafe")
+
+    def get_inference_buffers(self, inference_session: InferenceSession) -> SimpleNamespace:
+        # Buffers of the calling thread for the session
+        thread_buffers = self.inference_buffers
+        if not hasattr(thread_buffers, "sessions"): thread_buffers.sessions = {}
+
+        return thread_buffers.sessions.setdefault(id(inference_session), SimpleNamespace(shape = None, io_binding = None, generation = None))
+
+    def release_inference_buffers(self, inference_session: InferenceSession = None) -> None:
+        inference_session = inference_session or self.inferenceSession
+        buffers = self.get_inference_buffers(inference_session)
+
+        if buffers.io_binding != None:
+            buffers.io_binding.clear_binding_inputs()
+            buffers.io_binding.clear_binding_outputs()
+
+        buffers.shape         = None
+        buffers.input_buffer  = None
+        buffers.output_buffer = None
+        buffers.io_binding    = None
+
+    def prepare_inference_buffers(self, inference_session: InferenceSession, input_shape: tuple) -> SimpleNamespace:
+        buffers = self.get_inference_buffers(inference_session)
+        if buffers.shape == input_shape and buffers.generation == self.inference_buffers_generation: return buffers
+
+        # New input shape or tiles resolution reduced, old buffers are released before allocating the new ones
+        self.release_inference_buffers(inference_session)
+
+        onnx_input   = inference_session.get_inputs()[0]
+        onnx_output  = inference_session.get_outputs()[0]
+        input_dtype  = self._get_tensor_dtype(onnx_input.type)
+        output_dtype = self._get_tensor_dtype(onnx_output.type)
+
+        if input_dtype == uint8:
+            # uint8 NHWC image input/output
+            batch, height, width, channels = input_shape
+            output_shape = (batch, height * self.upscale_factor, width * self.upscale_factor, channels)
+        else:
+            batch, channels, height, width = input_shape
+            output_shape = (batch, channels, height * self.upscale_factor, width * self.upscale_factor)
+
+        buffers.input_buffer  = numpy_empty(input_shape,  dtype = input_dtype)
+        buffers.output_buffer = numpy_empty(output_shape, dtype = output_dtype)
+
+        buffers.io_binding = inference_session.io_binding()
+        buffers.io_binding.bind_input(
+            name         = onnx_input.name,
+            device_type  = "cpu",
+            device_id    = 0,
+            element_type = input_dtype,
+            shape        = input_shape,
+            buffer_ptr   = buffers.input_buffer.ctypes.data
+        )
+        buffers.io_binding.bind_output(
+            name         = onnx_output.name,
+            device_type  = "cpu",
+            device_id    = 0,
+            element_type = output_dtype,
+            shape        = output_shape,
+            buffer_ptr   = buffers.output_buffer.ctypes.data
+        )
 
-        return image
+        buffers.shape      = input_shape
+        buffers.generation = self.inference_buffers_generation
 
-    def onnxruntime_inference(self, image: numpy_ndarray) -> numpy_ndarray:
+        return buffers
 
-        # IO BINDING
-        #io_binding = self.inferenceSession.io_binding()
-        #io_binding.bind_cpu_input(self.inferenceSession.get_inputs()[0].name, image.astype(float16))
-        #io_binding.bind_output(self.inferenceSession.get_outputs()[0].name)
-        #self.inferenceSession.run_with_iobinding(io_binding)
-        #onnx_output = io_binding.copy_outputs_to_cpu()[0]
+    def onnxruntime_inference(self, image: numpy_ndarray, inference_session: InferenceSession = None) -> numpy_ndarray:
+        inference_session = inference_session or self.inferenceSession
 
-        onnx_input  = {self.inferenceSession.get_inputs()[0].name: image}
-        onnx_output = self.inferenceSession.run(None, onnx_input)[0]
+        # IO BINDING with buffers reused between calls with the same input shape
+        # the returned array is overwritten by the next inference of the same thread
+        buffers = self.prepare_inference_buffers(inference_session, image.shape)
+        numpy_copyto(buffers.input_buffer, image, casting = "unsafe")
+        self.run_inference(inference_session, buffers)
 
-        return onnx_output
+        return buffers.output_buffer
 
-    def postprocess_output(self, onnx_output: numpy_ndarray) -> numpy_ndarray:
-        onnx_output = numpy_squeeze(onnx_output, axis=0)
-        onnx_output = numpy_clip(onnx_output, 0, 1)
-        onnx_output = numpy_transpose(onnx_output, (1, 2, 0))
+    def run_inference(self, inference_session: InferenceSession, buffers: SimpleNamespace) -> None:
+        if self.inference_lock != None:
+            with self.inference_lock: inference_session.run_with_iobinding(buffers.io_binding)
+        else:
+            inference_session.run_with_iobinding(buffers.io_binding)
 
-        return onnx_output.astype(float32)
+        if not self.first_frame_done:
+            self.first_frame_done = True
+            print(f" Time to first output: {timer() - self.session_start_time:.2f}s")
 
-    def de_normalize_image(self, onnx_output: numpy_ndarray, max_range: int) -> numpy_ndarray:    
-        match max_range:
-            case 255:   return (onnx_output * max_range).astype(uint8)
-            case 65535: return (onnx_output * max_range).round().astype(float32)
+    def postprocess_output(
+            self, 
+            onnx_output: numpy_ndarray, 
+            range: int, 
+            output_image: numpy_ndarray
+            ) -> None:
+        
+        # Clip in place on the inference output buffer, 
+        # CHW ➜ HWC and [0, 1] ➜ [0, range] written in the output image
+        numpy_clip(onnx_output, 0, 1, out = onnx_output)
+        if range == 65535: numpy_add(onnx_output, 0.5 / range, out = onnx_output) # rounding for 16 bit
+        numpy_multiply(numpy_transpose(onnx_output, (1, 2, 0)), range, out = output_image, dtype = float32, casting = "unsafe")
 
+    def get_alpha_mode(self, alpha: numpy_ndarray) -> str:
+        # Opaque - no transparency, alpha channel not upscaled
+        # Resize - simple mask (only opaque/transparent pixels and few soft edges), alpha channel resized
+        # AI     - complex transparency, alpha channel upscaled by AI
+        range = self.get_image_range(alpha)
 
+        if numpy_min(alpha) == range: return "Opaque"
 
-    def AI_upscale(self, image: numpy_ndarray) -> numpy_ndarray:
-        image        = image.astype(float32)
-        image_mode   = self.get_image_mode(image)
-        image, range = self.normalize_image(image)
+        alpha_sample       = alpha[::ALPHA_SAMPLING_STEP, ::ALPHA_SAMPLING_STEP]
+        intermediate_ratio = numpy_count_nonzero((alpha_sample > 0) & (alpha_sample < range)) / alpha_sample.size
 
-        match image_mode:
+        if intermediate_ratio <= ALPHA_MASK_MAX_INTERMEDIATE: 
+            return "Resize"
+        else:
+            return "AI"
+
+    def resize_alpha(self, alpha: numpy_ndarray) -> numpy_ndarray:
+        t_height, t_width = self.calculate_target_resolution(alpha)
+        return opencv_resize(alpha, (t_width, t_height), interpolation = INTER_LINEAR)
+
+    def postprocess_alpha(
+            self, 
+            onnx_output: numpy_ndarray, 
+            range: int, 
+            output_alpha: numpy_ndarray
+            ) -> None:
+        
+        # RGB ➜ Gray of the upscaled alpha, written in the output image alpha channel
+        numpy_clip(onnx_output, 0, 1, out = onnx_output)
+        numpy_einsum("c,chw->hw", RGB2GRAY_WEIGHTS * range, onnx_output, out = output_alpha, dtype = float32, casting = "unsafe")
+
+
+
+    def AI_upscale_uint8(self, image: numpy_ndarray) -> numpy_ndarray:
+        # Pre/post-processing inside the graph, uint8 HWC in ➜ uint8 HWC out
+        match self.get_image_mode(image):
             case "RGB":
-                image = self.preprocess_image(image)
-                onnx_output  = self.onnxruntime_inference(image)
-                onnx_output  = self.postprocess_output(onnx_output)
-                output_image = self.de_normalize_image(onnx_output, range)
+                onnx_output = self.onnxruntime_inference(image[None])
+
+                return onnx_output[0].copy()
 
-                return output_image
-            
             case "RGBA":
-                alpha = image[:, :, 3]
-                image = image[:, :, :3]
-                image = opencv_cvtColor(image, COLOR_BGR2RGB)
+                alpha      = image[:, :, 3]
+                alpha_mode = self.get_alpha_mode(alpha)
+                image      = opencv_cvtColor(image[:, :, :3], COLOR_BGR2RGB)
+
+                if alpha_mode == "AI" and self.batch_supported:
+                    # Image and alpha upscaled in the same run
+                    onnx_output  = self.onnxruntime_inference(numpy_stack((image, opencv_cvtColor(alpha, COLOR_GRAY2RGB))))
+                    output_image = opencv_cvtColor(onnx_output[0], COLOR_BGR2RGBA)
+                    output_image[:, :, 3] = opencv_cvtColor(onnx_output[1], COLOR_RGB2GRAY)
 
-                image = image.astype(float32)
-                alpha = alpha.astype(float32)
+                    return output_image
 
                 # Image
-                image = self.preprocess_image(image)
-                onnx_output_image = self.onnxruntime_inference(image)
-                onnx_output_image = self.postprocess_output(onnx_output_image)
-                onnx_output_image = opencv_cvtColor(onnx_output_image, COLOR_BGR2RGBA)
+                onnx_output_image = self.onnxruntime_inference(image[None])
+                output_image      = opencv_cvtColor(onnx_output_image[0], COLOR_BGR2RGBA)
 
                 # Alpha
-                alpha = numpy_expand_dims(alpha, axis=-1)
-                alpha = numpy_repeat(alpha, 3, axis=-1)
-                alpha = self.preprocess_image(alpha)
-                onnx_output_alpha = self.onnxruntime_inference(alpha)
-                onnx_output_alpha = self.postprocess_output(onnx_output_alpha)
-                onnx_output_alpha = opencv_cvtColor(onnx_output_alpha, COLOR_RGB2GRAY)
+                match alpha_mode:
+                    case "Opaque": 
+                        pass # BGR ➜ BGRA already added the opaque alpha
+                    case "Resize":
+                        output_image[:, :, 3] = self.resize_alpha(alpha)
+                    case "AI":
+                        onnx_output_alpha = self.onnxruntime_inference(opencv_cvtColor(alpha, COLOR_GRAY2RGB)[None])
+                        output_image[:, :, 3] = opencv_cvtColor(onnx_output_alpha[0], COLOR_RGB2GRAY)
+
+                return output_image
+
+            case "Grayscale":
+                image       = opencv_cvtColor(image, COLOR_GRAY2RGB)
+                onnx_output = self.onnxruntime_inference(image[None])
+
+                return onnx_output[0].copy()
+
+    def AI_upscale(self, image: numpy_ndarray) -> numpy_ndarray:
+        if self.uint8_io and image.dtype == uint8: return self.AI_upscale_uint8(image)
 
-                # Fusion Image + Alpha
-                onnx_output_image[:, :, 3] = onnx_output_alpha
-                output_image = self.de_normalize_image(onnx_output_image, range)
+        # NumPy pre/post-processing, 16 bit images or models without uint8 input/output
+        # only the output image is allocated, everything else is done in the inference buffers
+        inference_session = self.get_float_inferenceSession()
+
+        image_mode        = self.get_image_mode(image)
+        range             = self.get_image_range(image)
+        output_dtype      = uint8 if range == 255 else uint16
+        height, width     = self.get_image_resolution(image)
+        t_height, t_width = self.calculate_target_resolution(image)
+        buffers           = self.prepare_inference_buffers(inference_session, (1, 3, height, width))
+
+        match image_mode:
+            case "RGB":
+                output_image = numpy_empty((t_height, t_width, 3), dtype = output_dtype)
+
+                self.preprocess_image(image, range, buffers.input_buffer[0])
+                self.run_inference(inference_session, buffers)
+                self.postprocess_output(buffers.output_buffer[0], range, output_image)
+
+                return output_image
+            
+            case "RGBA":
+                output_image = numpy_empty((t_height, t_width, 4), dtype = output_dtype)
+                alpha        = image[:, :, 3]
+                alpha_mode   = self.get_alpha_mode(alpha)
+
+                if alpha_mode == "AI" and self.batch_supported:
+                    # Image and alpha upscaled in the same run
+                    buffers = self.prepare_inference_buffers(inference_session, (2, 3, height, width))
+                    self.preprocess_image(image[:, :, 2::-1], range, buffers.input_buffer[0])
+                    self.preprocess_image(alpha, range, buffers.input_buffer[1])
+                    self.run_inference(inference_session, buffers)
+                    self.postprocess_output(buffers.output_buffer[0], range, output_image[:, :, 2::-1])
+                    self.postprocess_alpha(buffers.output_buffer[1], range, output_image[:, :, 3])
+
+                    return output_image
+
+                # Image (BGR ➜ RGB ➜ BGR with reversed channels views)
+                self.preprocess_image(image[:, :, 2::-1], range, buffers.input_buffer[0])
+                self.run_inference(inference_session, buffers)
+                self.postprocess_output(buffers.output_buffer[0], range, output_image[:, :, 2::-1])
+
+                # Alpha
+                match alpha_mode:
+                    case "Opaque":
+                        output_image[:, :, 3] = range
+                    case "Resize":
+                        output_image[:, :, 3] = self.resize_alpha(alpha)
+                    case "AI":
+                        self.preprocess_image(alpha, range, buffers.input_buffer[0])
+                        self.run_inference(inference_session, buffers)
+                        self.postprocess_alpha(buffers.output_buffer[0], range, output_image[:, :, 3])
 
                 return output_image
             
             case "Grayscale":
-                image = opencv_cvtColor(image, COLOR_GRAY2RGB)
-                
-                image = self.preprocess_image(image)
-                onnx_output  = self.onnxruntime_inference(image)
-                onnx_output  = self.postprocess_output(onnx_output)
-                output_image = opencv_cvtColor(onnx_output, COLOR_RGB2GRAY)
-                output_image = self.de_normalize_image(onnx_output, range)
+                output_image = numpy_empty((t_height, t_width, 3), dtype = output_dtype)
+
+                self.preprocess_image(image, range, buffers.input_buffer[0])
+                self.run_inference(inference_session, buffers)
+                self.postprocess_output(buffers.output_buffer[0], range, output_image)
 
                 return output_image
 
-    def AI_upscale_with_tilling(self, image: numpy_ndarray) -> numpy_ndarray:
+    def AI_upscale_batch(self, images: list[numpy_ndarray]) -> list[numpy_ndarray]:
+        # Same size RGB images stacked in a single tensor, one session run for all
+        if self.uint8_io and images[0].dtype == uint8:
+            onnx_output = self.onnxruntime_inference(numpy_stack(images))
+
+            return [output.copy() for output in onnx_output]
+
+        inference_session = self.get_float_inferenceSession()
+
+        range             = self.get_image_range(images[0])
+        output_dtype      = uint8 if range == 255 else uint16
+        height, width     = self.get_image_resolution(images[0])
+        t_height, t_width = self.calculate_target_resolution(images[0])
+        buffers           = self.prepare_inference_buffers(inference_session, (len(images), 3, height, width))
+        output_images     = [numpy_empty((t_height, t_width, 3), dtype = output_dtype) for _ in images]
+
+        for image_index, image in enumerate(images): 
+            self.preprocess_image(image, range, buffers.input_buffer[image_index])
+
+        self.run_inference(inference_session, buffers)
+
+        for image_index, output_image in enumerate(output_images): 
+            self.postprocess_output(buffers.output_buffer[image_index], range, output_image)
+
+        return output_images
+
+    def AI_upscale_with_tilling(
+            self, 
+            image: numpy_ndarray, 
+            tiles_checkpoint: "TilesCheckpoint" = None
+            ) -> numpy_ndarray:
+        
         t_height, t_width = self.calculate_target_resolution(image)
-        tiles_x, tiles_y  = self.calculate_tiles_number(image)
-        tiles_list        = self.split_image_into_tiles(image, tiles_x, tiles_y)
-        tiles_list        = [self.AI_upscale(tile) for tile in tiles_list]
+        tiles_positions   = self.calculate_tiles_positions(image)
+        batches_number    = math_ceil(len(tiles_positions) / self.calculate_tiles_batch_size())
+        tiles_batch_size  = math_ceil(len(tiles_positions) / batches_number)
+        overlaps_y        = self.calculate_axis_tiles_overlaps(sorted({y_start for y_start, _ in tiles_positions}))
+        overlaps_x        = self.calculate_axis_tiles_overlaps(sorted({x_start for _, x_start in tiles_positions}))
+        tiled_image       = None
+
+        def write_tile(tile_index: int, upscaled_tile: numpy_ndarray) -> None:
+            nonlocal tiled_image
+            y_start, x_start = tiles_positions[tile_index]
+            if tiled_image is None:
+                tiled_image = create_output_canvas((t_height, t_width, upscaled_tile.shape[2]), upscaled_tile.dtype, self.output_memory_limit)
+            self.write_tile_into_image(tiled_image, upscaled_tile, y_start, x_start, overlaps_y[y_start], overlaps_x[x_start])
+
+        if len(tiles_positions) < TILES_CHECKPOINT_MIN: tiles_checkpoint = None
+
+        # Tiles saved by an interrupted upscale with the same tiles blended again in the same order
+        tiles_settings  = { "tile_size": self.tile_size, "tiles_overlap": self.tiles_overlap, "tiles_number": len(tiles_positions) }
+        completed_tiles = tiles_checkpoint.start(tiles_settings) if tiles_checkpoint != None else 0
+        batches_start   = range(completed_tiles, len(tiles_positions), tiles_batch_size)
+        upscale_batch   = lambda batch_start: self.upscale_tiles(self.split_image_into_tiles(image, tiles_positions[batch_start:batch_start + tiles_batch_size]), tiles_batch_size)
+
+        try:
+            if completed_tiles > 0:
+                print(f" Resuming from tile {completed_tiles + 1}/{len(tiles_positions)}")
+                for tile_index in range(completed_tiles): write_tile(tile_index, tiles_checkpoint.read_tile(tile_index))
+
+            # Batches upscaled by the workers (or inline), written into the image in order as soon as ready
+            upscaled_batches = self.tiles_pool.imap(upscale_batch, batches_start) if self.tiles_pool != None else map(upscale_batch, batches_start)
+            for batch_start, upscaled_tiles in zip(batches_start, upscaled_batches):
+                for tile_offset, upscaled_tile in enumerate(upscaled_tiles): 
+                    write_tile(batch_start + tile_offset, upscaled_tile)
+                if tiles_checkpoint != None: 
+                    tiles_checkpoint.save_tiles(batch_start, upscaled_tiles)
+        except BaseException:
+            # Memory-mapped canvas of the failed upscale not left in the AI cache
+            if isinstance(tiled_image, numpy_memmap):
+                canvas_path, tiled_image = tiled_image.filename, None
+                remove_output_canvas(canvas_path)
+            raise
+
+        return tiled_image
+
+    def AI_upscale_reusing_static_tiles(
+            self, 
+            image: numpy_ndarray, 
+            static_tiles_detector: "StaticTilesDetector"
+            ) -> numpy_ndarray:
+
+        # Only the tiles changed since the previous frame upscaled (fewer pixels than the whole frame), 
+        # all the tiles (reused or new) blended again in the output frame
+        tile_size         = min(self.tile_size, STATIC_TILES_SIZE)
+        factor            = self.upscale_factor
+        height, width     = self.get_image_resolution(image)
+        t_height, t_width = self.calculate_target_resolution(image)
+        tiles_positions   = self.calculate_tiles_positions(image, tile_size)
+        tiles             = self.split_image_into_tiles(image, tiles_positions, tile_size)
+
+        static_tiles, thumbnails = static_tiles_detector.find_static_tiles(tiles_positions, tiles)
+        changed_tiles = [tile_index for tile_index, is_static in enumerate(static_tiles) if not is_static]
+
+        # Not enough static tiles to save work, whole frame upscaled and cut in the reference tiles
+        if len(changed_tiles) * tile_size * tile_size >= height * width:
+            upscaled_image = self.AI_upscale_resized_image(image)
+            upscaled_tiles = [upscaled_image[y_start * factor:(y_start + tile_size) * factor, x_start * factor:(x_start + tile_size) * factor] for y_start, x_start in tiles_positions]
+            static_tiles_detector.update_references(tiles_positions, thumbnails, [False] * len(tiles), upscaled_tiles)
+            return upscaled_image
+
+        # Changed tiles number different for every frame, batches padded to the fixed 
+        # batch size so the same input shape stays bound from one frame to the next
+        tiles_batch_size = self.calculate_tiles_batch_size(tile_size)
+        batches_start    = range(0, len(changed_tiles), tiles_batch_size)
+        upscale_batch    = lambda batch_start: self.upscale_tiles([tiles[tile_index] for tile_index in changed_tiles[batch_start:batch_start + tiles_batch_size]], tiles_batch_size)
+        upscaled_tiles   = [static_tiles_detector.get_upscaled_tile(tile_index) if is_static else None for tile_index, is_static in enumerate(static_tiles)]
+
+        # Changed tiles upscaled by the tiles workers (or inline)
+        upscaled_batches = self.tiles_pool.imap(upscale_batch, batches_start) if self.tiles_pool != None else map(upscale_batch, batches_start)
+        for batch_start, batch_upscaled_tiles in zip(batches_start, upscaled_batches):
+            for tile_index, upscaled_tile in zip(changed_tiles[batch_start:batch_start + tiles_batch_size], batch_upscaled_tiles):
+                upscaled_tiles[tile_index] = upscaled_tile
+
+        static_tiles_detector.update_references(tiles_positions, thumbnails, static_tiles, upscaled_tiles)
+
+        overlaps_y  = self.calculate_axis_tiles_overlaps(sorted({y_start for y_start, _ in tiles_positions}), tile_size)
+        overlaps_x  = self.calculate_axis_tiles_overlaps(sorted({x_start for _, x_start in tiles_positions}), tile_size)
+        tiled_image = numpy_empty((t_height, t_width, upscaled_tiles[0].shape[2]), dtype = upscaled_tiles[0].dtype)
+        for (y_start, x_start), upscaled_tile in zip(tiles_positions, upscaled_tiles):
+            self.write_tile_into_image(tiled_image, upscaled_tile, y_start, x_start, overlaps_y[y_start], overlaps_x[x_start], tile_size)
+
+        return tiled_image
+
+
+    def reduce_tiles_resolution(self, failed_resolution: int) -> bool:
+        with self.out_of_memory_lock:
+            # Already reduced by another thread after the same failure
+            if self.max_resolution < failed_resolution: return True
+            if self.max_resolution <= OUT_OF_MEMORY_MIN_RESOLUTION: return False
 
-        return self.combine_tiles_into_image(image, tiles_list, t_height, t_width, tiles_x)
+            # Buffers of the calling thread released now, the ones of the other threads 
+            # and pooled sessions invalidated and released by their thread at the next run
+            max_resolution = max(self.max_resolution // 2, OUT_OF_MEMORY_MIN_RESOLUTION)
+            for AI_session in self.pooled_sessions:
+                AI_session.max_resolution = min(AI_session.max_resolution, max_resolution)
+                AI_session.set_tiles_settings(min(AI_session.tile_size, max_resolution), AI_session.tiles_workers)
+                AI_session.inference_buffers_generation += 1
+            self.release_inference_buffers()
+
+            print(f" Out of memory with tiles resolution {failed_resolution}px, reduced to {self.max_resolution}px for the rest of the job")
+
+            return True
+
+    def run_with_out_of_memory_backoff(self, function: Callable, *arguments):
+        while True:
+            failed_resolution = self.max_resolution
+            try:
+                return function(*arguments)
+            except Exception as exception:
+                if not is_out_of_memory_error(exception) or not self.reduce_tiles_resolution(failed_resolution): raise
 
 
     # EXTERNAL FUNCTION
 
-    def AI_orchestration(self, image: numpy_ndarray) -> numpy_ndarray:
+    def AI_warmup(self, batch: int, height: int, width: int, tiled: bool) -> None:
+        # Runs at the inference shape of the first file through the same entry point, on the threads that 
+        # will run it: kernels selection, memory arena growth and inference buffers done before the first file 
+        # (not counted as first output). Tiles workers take one warmup each, held by the barrier
+        start_timer = timer()
+        first_frame_done, self.first_frame_done = self.first_frame_done, True
+        images = [numpy_full((height, width, 3), 127, dtype = uint8)] * batch
+        run_warmup = lambda _ = None: self.AI_upscale_batch(images) if batch > 1 else self.AI_upscale(images[0])
+
+        try:
+            if tiled and self.tiles_pool != None:
+                workers_barrier = Barrier(self.tiles_workers)
+                self.tiles_pool.map(lambda _: run_warmup(workers_barrier.wait()), range(self.tiles_workers), chunksize = 1)
+            else:
+                run_warmup()
+            print(f" Warmup at {batch}x{width}x{height} in {timer() - start_timer:.2f}s")
+        except Exception as exception:
+            print(f" Warmup at {batch}x{width}x{height} failed: {exception}")
+        finally:
+            self.first_frame_done = first_frame_done
+
+    def AI_upscale_bucketed(self, image: numpy_ndarray) -> numpy_ndarray:
+        # Image padded by reflection to its bucket shape, padding cropped after the upscale
+        height, width               = self.get_image_resolution(image)
+        bucket_height, bucket_width = self.calculate_bucket_resolution(image)
+
+        if (bucket_height, bucket_width) == (height, width): return self.AI_upscale(image)
+
+        padded_image   = opencv_copyMakeBorder(image, 0, bucket_height - height, 0, bucket_width - width, BORDER_REFLECT_101)
+        upscaled_image = self.AI_upscale(padded_image)
+
+        return upscaled_image[:height * self.upscale_factor, :width * self.upscale_factor]
+
+    def AI_orchestration(
+            self, 
+            image: numpy_ndarray, 
+            tiles_checkpoint: "TilesCheckpoint" = None,
+            shape_bucketing: bool = False
+            ) -> numpy_ndarray:
+
+        resized_image = self.resize_image_with_resize_factor(image)
+        
+        return self.run_with_out_of_memory_backoff(self.AI_upscale_resized_image, resized_image, tiles_checkpoint, shape_bucketing)
+
+    def AI_orchestration_reusing_static_tiles(
+            self, 
+            image: numpy_ndarray, 
+            static_tiles_detector: "StaticTilesDetector"
+            ) -> numpy_ndarray:
 
         resized_image = self.resize_image_with_resize_factor(image)
+
+        return self.run_with_out_of_memory_backoff(self.AI_upscale_reusing_static_tiles, resized_image, static_tiles_detector)
+
+    def AI_upscale_resized_image(
+            self, 
+            resized_image: numpy_ndarray, 
+            tiles_checkpoint: "TilesCheckpoint" = None,
+            shape_bucketing: bool = False
+            ) -> numpy_ndarray:
         
-        if self.image_need_tilling(resized_image):
-            return self.AI_upscale_with_tilling(resized_image)
+        # Images of different resolutions (not video frames) padded to few bucket shapes, 
+        # the session reuses the same memory plans instead of one for every resolution
+        if shape_bucketing:
+            bucket_height, bucket_width = self.calculate_bucket_resolution(resized_image)
+            need_tilling = bucket_height * bucket_width > self.max_resolution * self.max_resolution
+        else:
+            need_tilling = self.image_need_tilling(resized_image)
+
+        if need_tilling:
+            return self.AI_upscale_with_tilling(resized_image, tiles_checkpoint)
+        elif shape_bucketing:
+            return self.AI_upscale_bucketed(resized_image)
         else:
             return self.AI_upscale(resized_image)
 
+    def AI_orchestration_region_reader(
+            self, 
+            image_reader: "ImageRegionReader", 
+            tiles_checkpoint: "TilesCheckpoint" = None
+            ) -> numpy_ndarray:
+
+        # Input image already resized region by region by the reader
+        if self.image_need_tilling(image_reader):
+            return self.run_with_out_of_memory_backoff(self.AI_upscale_with_tilling, image_reader, tiles_checkpoint)
+        else:
+            height, width = self.get_image_resolution(image_reader)
+            return self.run_with_out_of_memory_backoff(self.AI_upscale_resized_image, image_reader[0:height, 0:width], None, True)
+
+    def AI_orchestration_batch(self, images: list[numpy_ndarray]) -> list[numpy_ndarray]:
+
+        resized_images = [self.resize_image_with_resize_factor(image) for image in images]
+
+        return self.run_with_out_of_memory_backoff(self.AI_upscale_resized_images, resized_images)
+
+    def AI_upscale_resized_images(self, resized_images: list[numpy_ndarray]) -> list[numpy_ndarray]:
+        first_image   = resized_images[0]
+        height, width = self.get_image_resolution(first_image)
+
+        # Batch in the tiles resolution, it can be reduced after an allocation error
+        batch_compatible = (
+            self.batch_supported
+            and len(resized_images) > 1
+            and all(self.get_image_mode(image) == "RGB" for image in resized_images)
+            and all(image.shape == first_image.shape for image in resized_images)
+            and not self.image_need_tilling(first_image)
+            and len(resized_images) * height * width <= self.max_resolution * self.max_resolution
+        )
+
+        if batch_compatible:
+            return self.AI_upscale_batch(resized_images)
+        else:
+            return [self.AI_upscale_resized_image(image) for image in resized_images]
+
+    def AI_orchestration_images_batch(self, images: list[numpy_ndarray]) -> list[numpy_ndarray]:
+
+        resized_images = [self.resize_image_with_resize_factor(image) for image in images]
+
+        return self.run_with_out_of_memory_backoff(self.AI_upscale_resized_images_packed, resized_images)
+
+    def AI_upscale_resized_images_packed(self, resized_images: list[numpy_ndarray]) -> list[numpy_ndarray]:
+        # Small images of any resolution grouped by bucket shape and bit depth,
+        # padded to the bucket shape and upscaled together in few session runs
+        images_groups = {}
+        for image_index, image in enumerate(resized_images):
+            group_key = (self.calculate_bucket_resolution(image), image.dtype)
+            images_groups.setdefault(group_key, []).append(image_index)
+
+        upscaled_images = [None] * len(resized_images)
+
+        for (bucket_resolution, _), images_indexes in images_groups.items():
+            bucket_height, bucket_width = bucket_resolution
+            images_batch_size = self.calculate_images_batch_size(bucket_resolution)
+
+            # Bucket bigger than the tiles resolution (reduced after an allocation error)
+            if images_batch_size < 2:
+                for image_index in images_indexes:
+                    upscaled_images[image_index] = self.AI_upscale_resized_image(resized_images[image_index], None, True)
+                continue
+
+            # Every image is one RGB entry of the batch, RGBA images with complex alpha are two
+            batch_entries = []
+            alpha_modes   = {}
+            for image_index in images_indexes:
+                image         = resized_images[image_index]
+                height, width = self.get_image_resolution(image)
+                image         = opencv_copyMakeBorder(image, 0, bucket_height - height, 0, bucket_width - width, BORDER_REFLECT_101)
+
+                match self.get_image_mode(image):
+                    case "RGB":
+                        batch_entries.append(image)
+                    case "Grayscale":
+                        batch_entries.append(opencv_cvtColor(image, COLOR_GRAY2RGB))
+                    case "RGBA":
+                        alpha_modes[image_index] = self.get_alpha_mode(image[:, :, 3])
+                        batch_entries.append(image[:, :, 2::-1])
+                        if alpha_modes[image_index] == "AI":
+                            batch_entries.append(opencv_cvtColor(image[:, :, 3], COLOR_GRAY2RGB))
+
+            upscaled_entries = []
+            for batch_start in range(0, len(batch_entries), images_batch_size):
+                upscaled_entries.extend(self.AI_upscale_batch(batch_entries[batch_start:batch_start + images_batch_size]))
+
+            # Entries merged back in images, bucket padding cropped
+            upscaled_entries = iter(upscaled_entries)
+            for image_index in images_indexes:
+                image          = resized_images[image_index]
+                height, width  = self.get_image_resolution(image)
+                upscaled_image = next(upscaled_entries)
+
+                if image_index in alpha_modes:
+                    upscaled_image = opencv_cvtColor(upscaled_image, COLOR_BGR2RGBA)
+                    match alpha_modes[image_index]:
+                        case "Resize":
+                            alpha = opencv_copyMakeBorder(image[:, :, 3], 0, bucket_height - height, 0, bucket_width - width, BORDER_REFLECT_101)
+                            upscaled_image[:, :, 3] = self.resize_alpha(alpha)
+                        case "AI":
+                            upscaled_image[:, :, 3] = opencv_cvtColor(next(upscaled_entries), COLOR_RGB2GRAY)
+
+                upscaled_images[image_index] = upscaled_image[:height * self.upscale_factor, :width * self.upscale_factor]
+
+        return upscaled_images
+
 
 
 
@@ -1039,6 +2254,291 @@ def image_read(file_path: str) -> numpy_ndarray:
 def image_write(file_path: str, file_data: numpy_ndarray, file_extension: str = ".jpg") -> None: 
     opencv_imencode(file_extension, file_data)[1].tofile(file_path)
 
+def create_output_canvas(shape: tuple, dtype: type, memory_limit: int) -> numpy_ndarray:
+    canvas_bytes = int(numpy_prod(shape)) * numpy_dtype(dtype).itemsize
+    if memory_limit <= 0 or canvas_bytes <= memory_limit:
+        return numpy_empty(shape, dtype = dtype)
+
+    # Out-of-core, the image lives in a file on disk and only the pages in use stay in RAM
+    os_makedirs(AI_CACHE_PATH, exist_ok = True)
+    canvas_path = os_path_join(AI_CACHE_PATH, f"canvas_{os_getpid()}_{threading_get_ident()}.raw")
+    print(f" Output image {canvas_bytes / 1024**3:.1f}GB > RAM budget, memory-mapped in {canvas_path}")
+
+    return numpy_memmap(canvas_path, dtype = dtype, mode = "w+", shape = shape)
+
+def remove_output_canvas(canvas_path: str) -> None:
+    try:
+        if os_path_exists(canvas_path): os_remove(canvas_path)
+    except OSError:
+        pass
+
+def is_process_running(pid: int) -> bool:
+    # On Windows os.kill terminates the process, files still memory-mapped 
+    # by a running process can not be removed there anyway
+    if sys.platform == "win32": return False
+
+    try:
+        os_kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+def remove_stale_memory_mapped_files() -> None:
+    # Files named {prefix}_{pid}_{thread}.raw left by stopped or crashed processes
+    if not os_path_exists(AI_CACHE_PATH): return
+
+    for file_name in os_listdir(AI_CACHE_PATH):
+        file_prefix, _, file_pid = file_name.partition("_")
+        file_pid = file_pid.split("_")[0]
+        if file_prefix not in MEMORY_MAPPED_FILES_PREFIXES or not file_name.endswith(".raw") or not file_pid.isdigit(): continue
+        if int(file_pid) == os_getpid() or is_process_running(int(file_pid)): continue
+
+        remove_output_canvas(os_path_join(AI_CACHE_PATH, file_name))
+
+def calculate_strip_rows(image: numpy_ndarray) -> int:
+    row_bytes = image[0].nbytes
+    return max(1, OUT_OF_CORE_STRIP_BYTES // row_bytes)
+
+def png_write_chunk(file, chunk_type: bytes, chunk_data: bytes) -> None:
+    file.write(struct_pack(">I", len(chunk_data)))
+    file.write(chunk_type)
+    file.write(chunk_data)
+    file.write(struct_pack(">I", zlib_crc32(chunk_type + chunk_data)))
+
+def png_write_strips(file_path: str, image: numpy_ndarray) -> None:
+
+    # Streaming PNG encoder, rows compressed strip by strip with the "Up" filter
+    height, width = image.shape[:2]
+    channels      = 1 if image.ndim == 2 else image.shape[2]
+    bit_depth     = 16 if image.dtype == uint16 else 8
+    color_type    = { 1: 0, 3: 2, 4: 6 }[channels]
+    channels_order = { 1: None, 3: [2, 1, 0], 4: [2, 1, 0, 3] }[channels]
+    compressor    = zlib_compressobj(6)
+    previous_row  = None
+
+    with open(file_path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        png_write_chunk(file, b"IHDR", struct_pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0))
+
+        strip_rows = calculate_strip_rows(image)
+        for strip_start in range(0, height, strip_rows):
+            strip = image[strip_start:strip_start + strip_rows]
+            if channels_order != None: strip = strip[:, :, channels_order] # BGR(A) ➜ RGB(A)
+            if bit_depth == 16:        strip = strip.astype(">u2")
+
+            raw_rows      = strip.reshape(strip.shape[0], -1).view(uint8)
+            filtered_rows = raw_rows.copy()
+            filtered_rows[1:] -= raw_rows[:-1]
+            if previous_row is not None: filtered_rows[0] -= previous_row
+            previous_row  = raw_rows[-1].copy()
+
+            filter_bytes = numpy_full((strip.shape[0], 1), 2, dtype = uint8)
+            compressed   = compressor.compress(numpy_hstack((filter_bytes, filtered_rows)).tobytes())
+            if compressed: png_write_chunk(file, b"IDAT", compressed)
+
+        png_write_chunk(file, b"IDAT", compressor.flush())
+        png_write_chunk(file, b"IEND", b"")
+
+def tiff_strips_iterator(image: numpy_ndarray, strip_rows: int):
+    channels_order = { 3: [2, 1, 0], 4: [2, 1, 0, 3] }.get(image.shape[2] if image.ndim == 3 else 1)
+    for strip_start in range(0, image.shape[0], strip_rows):
+        strip = image[strip_start:strip_start + strip_rows]
+        yield strip[:, :, channels_order] if channels_order != None else numpy_array(strip)
+
+def image_write_out_of_core(file_path: str, image: numpy_ndarray, file_extension: str = ".jpg") -> None:
+    match file_extension:
+        case ".png":
+            png_write_strips(file_path, image)
+        case ".tiff" if tifffile_available:
+            strip_rows = calculate_strip_rows(image)
+            tifffile_imwrite(
+                file_path, 
+                data = tiff_strips_iterator(image, strip_rows), 
+                shape = image.shape, 
+                dtype = image.dtype, 
+                rowsperstrip = strip_rows,
+                photometric = "rgb" if image.ndim == 3 else "minisblack",
+                compression = "zlib",
+                extrasamples = ["unassalpha"] if image.ndim == 3 and image.shape[2] == 4 else None,
+                bigtiff = image.nbytes > 2**32 - 2**25
+            )
+        case _:
+            # Encoders without streaming support read the whole memory-mapped image
+            image_write(file_path, image, file_extension)
+
+class ImageRegionReader:
+
+    # TIFF input image decoded once in a memory-mapped file (BGR like image_read), 
+    # the tiler slices it like a numpy image and only the regions of each 
+    # tiles batch are read and resized with the resize factor
+
+    def __init__(self, file_path: str, resize_factor: float):
+        self.file_path     = file_path
+        self.resize_factor = resize_factor
+        self.source_path   = os_path_join(AI_CACHE_PATH, f"source_{os_getpid()}_{threading_get_ident()}.raw")
+        self.source        = self._decode_source()
+
+        source_height, source_width = get_image_resolution(self.source)
+        height = int(source_height * resize_factor) if resize_factor != 1 else source_height
+        width  = int(source_width  * resize_factor) if resize_factor != 1 else source_width
+
+        self.shape   = (height, width) + self.source.shape[2:]
+        self.ndim    = self.source.ndim
+        self.dtype   = self.source.dtype
+
+    def _decode_tiff_source(self) -> numpy_ndarray | None:
+        # Strips/tiles decoded one by one straight into the memory-mapped file
+        with TiffFile(self.file_path) as tiff_file:
+            page = tiff_file.pages[0]
+
+            supported_layout = (
+                page.photometric in (PHOTOMETRIC.RGB, PHOTOMETRIC.MINISBLACK)
+                and page.planarconfig == PLANARCONFIG.CONTIG
+                and page.dtype in (uint8, uint16)
+                and (len(page.shape) == 2 or (len(page.shape) == 3 and page.shape[2] in (3, 4)))
+            )
+            if not supported_layout: return None
+
+            source = page.asarray(out = self.source_path)
+
+        # RGB(A) ➜ BGR(A) in place, strip by strip
+        if source.ndim == 3:
+            channels_order = [2, 1, 0, 3][:source.shape[2]]
+            strip_rows     = calculate_strip_rows(source)
+            for strip_start in range(0, source.shape[0], strip_rows):
+                strip    = source[strip_start:strip_start + strip_rows]
+                strip[:] = strip[:, :, channels_order]
+
+        return source
+
+    def _decode_source(self) -> numpy_ndarray:
+        os_makedirs(AI_CACHE_PATH, exist_ok = True)
+
+        try:
+            source = self._decode_tiff_source()
+            if source is not None: return source
+        except Exception:
+            remove_output_canvas(self.source_path)
+
+        # TIFF layouts not readable by strips decoded in RAM, a memory-mapped copy would only add a full write
+        return image_read(self.file_path)
+
+    def __getitem__(self, region: tuple) -> numpy_ndarray:
+        region_y, region_x = region
+        y_start, y_end, _  = region_y.indices(self.shape[0])
+        x_start, x_end, _  = region_x.indices(self.shape[1])
+
+        if self.resize_factor == 1:
+            return numpy_array(self.source[y_start:y_end, x_start:x_end])
+
+        interpolation = INTER_LINEAR if self.resize_factor > 1 else INTER_AREA
+        return resize_image_region(self.source, y_start, y_end, x_start, x_end, self.shape[0], self.shape[1], interpolation)
+
+    def close(self) -> None:
+        self.source = None
+        remove_output_canvas(self.source_path)
+
+class TilesCheckpoint:
+
+    # Upscaled tiles saved on disk with a manifest of the input file hash and the AI settings,
+    # only the tiles counted in the manifest are valid (saved before the manifest update)
+
+    def __init__(self, checkpoint_path: str, checkpoint_key: dict, input_path: str):
+        self.checkpoint_path = checkpoint_path
+        self.manifest_path   = os_path_join(checkpoint_path, "manifest.json")
+        self.checkpoint_key  = checkpoint_key
+        self.input_path      = input_path
+        self.completed_tiles = 0
+
+    def start(self, tiles_settings: dict) -> int:
+        # Tiles settings known only by the tiler, they can change after an allocation error
+        # Input file hashed only here, images with few tiles never read twice
+        input_hash           = get_file_hash(self.input_path, os_stat(self.input_path).st_mtime)
+        self.checkpoint_key  = self.checkpoint_key | tiles_settings | { "input_hash": input_hash }
+        self.completed_tiles = self._read_completed_tiles()
+        return self.completed_tiles
+
+    def _read_completed_tiles(self) -> int:
+        try:
+            with open(self.manifest_path, "r") as manifest_file:
+                manifest = json_load(manifest_file)
+        except Exception:
+            return 0
+
+        if manifest.get("checkpoint_key") != self.checkpoint_key: return 0
+
+        return manifest.get("completed_tiles", 0)
+
+    def get_tile_path(self, tile_index: int) -> str:
+        return os_path_join(self.checkpoint_path, f"tile_{tile_index}.npy")
+
+    def read_tile(self, tile_index: int) -> numpy_ndarray:
+        return numpy_load(self.get_tile_path(tile_index))
+
+    def save_tiles(self, first_tile_index: int, tiles: list[numpy_ndarray]) -> None:
+        os_makedirs(self.checkpoint_path, exist_ok = True)
+
+        for tile_offset, tile in enumerate(tiles): 
+            numpy_save(self.get_tile_path(first_tile_index + tile_offset), tile)
+
+        self.completed_tiles = first_tile_index + len(tiles)
+
+        manifest = { "checkpoint_key": self.checkpoint_key, "completed_tiles": self.completed_tiles }
+        temporary_manifest_path = f"{self.manifest_path}.tmp"
+        with open(temporary_manifest_path, "w") as manifest_file:
+            manifest_file.write(json_dumps(manifest, indent = 4))
+        os_replace(temporary_manifest_path, self.manifest_path)
+
+    def remove(self) -> None:
+        if os_path_exists(self.checkpoint_path): remove_directory(self.checkpoint_path, ignore_errors = True)
+
+def prepare_tiles_checkpoint(
+        image_path: str, 
+        upscaled_image_path: str, 
+        AI_instance
+        ) -> TilesCheckpoint:
+    
+    checkpoint_path = f"{os_path_splitext(upscaled_image_path)[0]}_tiles_checkpoint"
+    checkpoint_key  = {
+        "AI_model":           AI_instance.AI_model_name,
+        "AI_precision":       AI_instance.AI_precision,
+        "execution_provider": AI_instance.execution_provider,
+        "resize_factor":      AI_instance.resize_factor,
+    }
+
+    return TilesCheckpoint(checkpoint_path, checkpoint_key, image_path)
+
+def use_image_region_reader(image_path: str, AI_instance) -> bool:
+    # Only TIFF files are decoded by strips, other formats are decoded in RAM anyway
+    if AI_instance.output_memory_limit <= 0: return False
+    if not tifffile_available or not image_path.lower().endswith((".tif", ".tiff")): return False
+
+    try:
+        with pillow_image_open(image_path) as image: 
+            width, height = image.size
+    except DecompressionBombError:
+        return True
+    except Exception:
+        return False
+
+    # Lower bound of the upscaled image size (8 bit RGB)
+    target_height = int(height * AI_instance.resize_factor) * AI_instance.upscale_factor
+    target_width  = int(width  * AI_instance.resize_factor) * AI_instance.upscale_factor
+
+    return target_height * target_width * 3 > AI_instance.output_memory_limit
+
+def use_images_batch(image_path: str, AI_instance) -> bool:
+    try:
+        with pillow_image_open(image_path) as image:
+            width, height = image.size
+    except Exception:
+        return False
+
+    return AI_instance.image_fits_images_batch(height, width)
+
 def copy_file_metadata(
         original_file_path: str, 
         upscaled_file_path: str
@@ -1057,7 +2557,7 @@ def copy_file_metadata(
     ]
     
     try: 
-        subprocess_run(exiftool_cmd, check = True, shell = "False")
+        subprocess_run(exiftool_cmd, check = True, shell = False)
     except:
         pass
 
@@ -1219,6 +2719,22 @@ def get_video_fps(video_path: str) -> float:
     video_capture.release()
     return frame_rate
    
+def get_file_resolution(file_path: str) -> tuple | None:
+    # Resolution from the file header, without decoding
+    try:
+        if check_if_file_is_video(file_path):
+            video_capture = opencv_VideoCapture(file_path)
+            height = int(video_capture.get(CAP_PROP_FRAME_HEIGHT))
+            width  = int(video_capture.get(CAP_PROP_FRAME_WIDTH))
+            video_capture.release()
+        else:
+            with pillow_image_open(file_path) as image:
+                width, height = image.size
+    except Exception:
+        return None
+
+    return (height, width) if height > 0 and width > 0 else None
+
 def get_image_resolution(image: numpy_ndarray) -> tuple:
     height = image.shape[0]
     width  = image.shape[1]
@@ -1274,51 +2790,252 @@ def extract_video_frames(
     
     return video_frames_list
 
+def get_video_codec(selected_video_extension: str) -> str:
+    match selected_video_extension:
+        case ".mp4 (x264)": return "libx264"
+        case ".mp4 (x265)": return "libx265"
+        case ".avi":        return "png"
+
+def get_video_encoding_settings(selected_video_extension: str, video_encoding_settings: dict = None) -> dict:
+    # Codec of the selected extension, 12M bitrate if CRF is not selected, 
+    # pixel format of the codec default (yuv420p for x264/x265)
+    default_encoding_settings = {
+        "codec":   get_video_codec(selected_video_extension),
+        "crf":     None,
+        "bitrate": "12M",
+        "preset":  "ultrafast",
+        "pix_fmt": None,
+    }
+
+    return default_encoding_settings | (video_encoding_settings or {})
+
 def video_encoding(
         video_path: str,
         video_output_path: str,
         upscaled_frame_paths: list[str], 
         cpu_number: int,
         selected_video_extension: str, 
+        video_encoding_settings: dict = None
         ) -> None:
-        
-    match selected_video_extension:
-        case ".mp4 (x264)": codec = "libx264"
-        case ".mp4 (x265)": codec = "libx265"
-        case ".avi":        codec = "png"
-
-    no_audio_path = f"{os_path_splitext(video_output_path)[0]}_no_audio{os_path_splitext(video_output_path)[1]}"
-    video_fps     = get_video_fps(video_path)
-    video_clip    = ImageSequenceClip.ImageSequenceClip(sequence = upscaled_frame_paths, fps = video_fps)
-
-    video_clip.write_videofile(
-        filename = no_audio_path,
-        fps      = video_fps,
-        codec    = codec,
-        threads  = cpu_number,
-        logger   = None,
-        audio    = None,
-        bitrate  = "12M",
-        preset   = "ultrafast"
+
+    # Upscaled frames decoded in parallel by chunks and piped in order to the encoder
+    frames_chunk_size = max(cpu_number, 1) * 2
+    first_frame       = image_read(upscaled_frame_paths[0])
+    height, width     = get_image_resolution(first_frame)
+    video_encoder     = VideoEncoder(
+        video_output_path, 
+        width, 
+        height, 
+        get_video_fps(video_path), 
+        get_video_encoding_settings(selected_video_extension, video_encoding_settings), 
+        cpu_number
     )
 
-    # Copy the audio from original video
-    audio_passthrough_command = [
+    try:
+        with ThreadPool(max(cpu_number, 1)) as pool:
+            for chunk_start in range(0, len(upscaled_frame_paths), frames_chunk_size):
+                for frame in pool.map(image_read, upscaled_frame_paths[chunk_start:chunk_start + frames_chunk_size]):
+                    video_encoder.write(frame)
+    finally:
+        video_encoder.close()
+
+def prepare_video_no_audio_path(video_output_path: str) -> str:
+    path_no_extension, extension = os_path_splitext(video_output_path)
+    return f"{path_no_extension}_no_audio{extension}"
+
+def video_audio_passthrough(
+        video_path: str,
+        video_no_audio_path: str,
+        video_output_path: str
+        ) -> None:
+    
+    # Audio of the original video copied in the encoded video, re-encoded when the output 
+    # container does not support its codec, otherwise the video is kept without audio
+    passthrough_command = [
         FFMPEG_EXE_PATH,
         "-y",
+        "-loglevel", "error",
+        "-i", video_no_audio_path,
         "-i", video_path,
-        "-i", no_audio_path,
+        "-map", "0:v:0",
+        "-map", "1:a?",
         "-c:v", "copy",
-        "-map", "1:v:0",
-        "-map", "0:a?",
-        "-c:a", "copy",
-        video_output_path
     ]
-    try: 
-        subprocess_run(audio_passthrough_command, check = True, shell = "False")
-        if os_path_exists(no_audio_path): os_remove(no_audio_path)
-    except:
-        pass
+
+    for audio_options in (["-c:a", "copy"], []):
+        try:
+            subprocess_run(passthrough_command + audio_options + [video_output_path], check = True, shell = False, capture_output = True)
+            os_remove(video_no_audio_path)
+            return
+        except Exception:
+            pass
+
+    print(f" Audio of {os_path_basename(video_path)} not supported in the output video, saved without audio")
+    os_replace(video_no_audio_path, video_output_path)
+
+class VideoEncoder:
+
+    # Numpy frames (bgr24, rgb24 or gray) piped in the stdin of one ffmpeg process, 
+    # video stream only, the audio is muxed afterwards by video_audio_passthrough
+
+    def __init__(
+            self, 
+            video_output_path: str, 
+            width: int, 
+            height: int, 
+            video_fps: float, 
+            encoding_settings: dict, 
+            cpu_number: int,
+            frames_pix_fmt: str = "bgr24"
+            ):
+        
+        self.video_output_path = video_output_path
+        self.encoded_frames    = 0
+        self.start_time        = None
+
+        codec   = encoding_settings["codec"]
+        pix_fmt = encoding_settings["pix_fmt"]
+        if pix_fmt == None and codec in ("libx264", "libx265") and width % 2 == 0 and height % 2 == 0: 
+            pix_fmt = "yuv420p"
+
+        encoding_command = [
+            FFMPEG_EXE_PATH,
+            "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", frames_pix_fmt,
+            "-s", f"{width}x{height}",
+            "-r", f"{video_fps}",
+            "-i", "-",
+            "-an",
+        ]
+
+        encoding_command += ["-c:v", codec, "-threads", str(cpu_number)]
+
+        if codec != "png":
+            if encoding_settings["crf"] != None: encoding_command += ["-crf", str(encoding_settings["crf"])]
+            else:                                encoding_command += ["-b:v", encoding_settings["bitrate"]]
+
+        if codec in ("libx264", "libx265") and encoding_settings["preset"] != None: 
+            encoding_command += ["-preset", encoding_settings["preset"]]
+
+        if pix_fmt != None: 
+            encoding_command += ["-pix_fmt", pix_fmt]
+
+        encoding_command.append(video_output_path)
+
+        self.process = subprocess_Popen(encoding_command, stdin = subprocess_PIPE, shell = False)
+
+    def write(self, frame: numpy_ndarray) -> None:
+        if self.start_time == None: self.start_time = timer()
+
+        self.process.stdin.write(numpy_ascontiguousarray(frame).data)
+        self.encoded_frames += 1
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        return_code = self.process.wait()
+
+        if self.start_time != None:
+            encoding_time = timer() - self.start_time
+            print(f" Encoded {self.encoded_frames} frames in {encoding_time:.2f}s ({self.encoded_frames / max(encoding_time, 1e-6):.1f} fps)")
+
+        if return_code != 0: 
+            raise Exception(f"ffmpeg encoding of {os_path_basename(self.video_output_path)} failed")
+
+class VideoJournal:
+
+    # Streamed video encoded in segments, the journal lists the completed segments with the input file hash 
+    # and the AI settings; only the segments in the journal are valid (closed before the journal update)
+
+    def __init__(self, journal_path: str, journal_key: dict, segment_extension: str):
+        self.journal_path      = journal_path
+        self.manifest_path     = os_path_join(journal_path, "journal.json")
+        self.journal_key       = journal_key
+        self.segment_extension = segment_extension
+        self.segments          = self._read_segments()
+
+    def _read_segments(self) -> list[dict]:
+        try:
+            with open(self.manifest_path, "r") as manifest_file:
+                manifest = json_load(manifest_file)
+        except Exception:
+            return []
+
+        if manifest.get("journal_key") != self.journal_key: return []
+
+        segments = manifest.get("segments", [])
+        if not all(os_path_exists(segment["path"]) for segment in segments): return []
+
+        return segments
+
+    def get_completed_frames(self) -> int:
+        return sum(segment["frames"] for segment in self.segments)
+
+    def start_segment(self) -> str:
+        os_makedirs(self.journal_path, exist_ok = True)
+        return os_path_join(self.journal_path, f"segment_{len(self.segments):05d}{self.segment_extension}")
+
+    def add_segment(self, segment_path: str, frames_number: int) -> None:
+        self.segments.append({ "path": segment_path, "frames": frames_number })
+
+        manifest = { "journal_key": self.journal_key, "segments": self.segments }
+        temporary_manifest_path = f"{self.manifest_path}.tmp"
+        with open(temporary_manifest_path, "w") as manifest_file:
+            manifest_file.write(json_dumps(manifest, indent = 4))
+        os_replace(temporary_manifest_path, self.manifest_path)
+
+    def concatenate_segments(self, video_output_path: str) -> None:
+        # Segments joined without re-encoding
+        segments_list_path = os_path_join(self.journal_path, "segments.txt")
+        with open(segments_list_path, "w") as segments_list_file:
+            for segment in self.segments: 
+                segments_list_file.write(f"file '{os_path_basename(segment['path'])}'\n")
+
+        concatenate_command = [
+            FFMPEG_EXE_PATH,
+            "-y",
+            "-loglevel", "error",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", segments_list_path,
+            "-c", "copy",
+            video_output_path
+        ]
+
+        subprocess_run(concatenate_command, check = True, shell = False)
+
+    def remove(self) -> None:
+        if os_path_exists(self.journal_path): remove_directory(self.journal_path, ignore_errors = True)
+
+def prepare_video_journal(
+        video_path: str,
+        video_output_path: str,
+        AI_instance,
+        selected_video_extension: str,
+        selected_interpolation_factor: float,
+        encoding_settings: dict,
+        held_frames_threshold: float = None,
+        static_tiles_threshold: float = None
+        ) -> VideoJournal:
+
+    journal_path = f"{os_path_splitext(video_output_path)[0]}_stream_journal"
+    journal_key  = {
+        "input_hash":           get_file_hash(video_path, os_stat(video_path).st_mtime),
+        "AI_model":             AI_instance.AI_model_name,
+        "AI_precision":         AI_instance.AI_precision,
+        "execution_provider":   AI_instance.execution_provider,
+        "resize_factor":        AI_instance.resize_factor,
+        "interpolation_factor": selected_interpolation_factor,
+        "video_extension":      selected_video_extension,
+        "encoding_settings":    encoding_settings,
+    }
+
+    # Segments encoded with frames reused by the held frames/static tiles options only valid with the same thresholds
+    if held_frames_threshold  != None: journal_key["held_frames_threshold"]  = held_frames_threshold
+    if static_tiles_threshold != None: journal_key["static_tiles_threshold"] = static_tiles_threshold
+
+    return VideoJournal(journal_path, journal_key, os_path_splitext(video_output_path)[1])
     
 def check_video_upscaling_resume(
         target_directory: str, 
@@ -1382,6 +3099,14 @@ def interpolate_images_and_save(
         starting_image_importance: float,
         file_extension: str = ".jpg"
         ) -> None:
+
+    image_write(target_path, interpolate_images(starting_image, upscaled_image, starting_image_importance), file_extension)
+
+def interpolate_images(
+        starting_image: numpy_ndarray,
+        upscaled_image: numpy_ndarray,
+        starting_image_importance: float
+        ) -> numpy_ndarray:
     
     def add_alpha_channel(image: numpy_ndarray) -> numpy_ndarray:
         if image.shape[2] == 3:
@@ -1417,10 +3142,126 @@ def interpolate_images_and_save(
             starting_image = add_alpha_channel(starting_image)
             upscaled_image = add_alpha_channel(upscaled_image)
 
-        interpolated_image = opencv_addWeighted(starting_image, starting_image_importance, upscaled_image, upscaled_image_importance, ZERO)
-        image_write(target_path, interpolated_image, file_extension)
+        return opencv_addWeighted(starting_image, starting_image_importance, upscaled_image, upscaled_image_importance, ZERO)
     except:
-        image_write(target_path, upscaled_image, file_extension)
+        return upscaled_image
+
+def warp_image_region(
+        source_image: numpy_ndarray,
+        y_start: int,
+        y_end: int,
+        x_start: int,
+        x_end: int,
+        scale_y: float,
+        scale_x: float
+        ) -> numpy_ndarray:
+    
+    # Region [y_start:y_end, x_start:x_end] of the source image linearly resized by 1/scale, 
+    # same sampling of opencv_resize reading only the source pixels needed
+    source_height, source_width = get_image_resolution(source_image)
+
+    source_y_start = min(max(0, int((y_start + 0.5) * scale_y - 0.5) - 1), source_height - 1)
+    source_y_end   = min(source_height, int((y_end + 0.5) * scale_y - 0.5) + 2)
+    source_x_start = min(max(0, int((x_start + 0.5) * scale_x - 0.5) - 1), source_width - 1)
+    source_x_end   = min(source_width, int((x_end + 0.5) * scale_x - 0.5) + 2)
+
+    warp_matrix = numpy_array([
+        [scale_x, 0, (x_start + 0.5) * scale_x - 0.5 - source_x_start], 
+        [0, scale_y, (y_start + 0.5) * scale_y - 0.5 - source_y_start]
+        ], dtype = float32)
+    
+    return opencv_warpAffine(
+        numpy_array(source_image[source_y_start:source_y_end, source_x_start:source_x_end]), 
+        warp_matrix, 
+        (x_end - x_start, y_end - y_start), 
+        flags = INTER_LINEAR | WARP_INVERSE_MAP, 
+        borderMode = BORDER_REPLICATE
+    )
+
+def calculate_resize_window(
+        start: int, 
+        end: int, 
+        size: int, 
+        source_size: int
+        ) -> tuple | None:
+    
+    # Resize sampling repeats every period pixels, a window aligned to the period 
+    # (plus one period of margin) resized alone gives the same pixels of the whole image
+    period = size // math_gcd(size, source_size)
+    if period > OUT_OF_CORE_RESIZE_PERIOD: return None
+
+    window_start = max(0, (start // period - 1) * period)
+    window_end   = min(size, (math_ceil(end / period) + 1) * period)
+    source_start = window_start * source_size // size
+    source_end   = source_size if window_end == size else window_end * source_size // size
+
+    return window_start, window_end, source_start, source_end
+
+def resize_image_region(
+        source_image: numpy_ndarray,
+        y_start: int,
+        y_end: int,
+        x_start: int,
+        x_end: int,
+        height: int,
+        width: int,
+        interpolation: int
+        ) -> numpy_ndarray:
+    
+    # Region [y_start:y_end, x_start:x_end] of source_image resized to height x width, 
+    # reading only the source pixels the region needs
+    source_height, source_width = get_image_resolution(source_image)
+    window_y = calculate_resize_window(y_start, y_end, height, source_height)
+    window_x = calculate_resize_window(x_start, x_end, width,  source_width)
+
+    if window_y != None and window_x != None:
+        window_y_start, window_y_end, source_y_start, source_y_end = window_y
+        window_x_start, window_x_end, source_x_start, source_x_end = window_x
+
+        resized_window = opencv_resize(
+            numpy_array(source_image[source_y_start:source_y_end, source_x_start:source_x_end]), 
+            (window_x_end - window_x_start, window_y_end - window_y_start), 
+            interpolation = interpolation
+        )
+        return resized_window[y_start - window_y_start:y_end - window_y_start, x_start - window_x_start:x_end - window_x_start]
+
+    # Sizes without a short period, approximated
+    scale_y = source_height / height
+    scale_x = source_width  / width
+    if interpolation == INTER_AREA:
+        source_y_end = min(source_height, math_ceil(y_end * scale_y))
+        source_x_end = min(source_width,  math_ceil(x_end * scale_x))
+        return opencv_resize(
+            numpy_array(source_image[int(y_start * scale_y):source_y_end, int(x_start * scale_x):source_x_end]), 
+            (x_end - x_start, y_end - y_start), 
+            interpolation = INTER_AREA
+        )
+    else:
+        return warp_image_region(source_image, y_start, y_end, x_start, x_end, scale_y, scale_x)
+
+def interpolate_images_out_of_core(
+        starting_image: numpy_ndarray,
+        upscaled_image: numpy_ndarray,
+        starting_image_importance: float
+        ) -> None:
+    
+    # Same interpolation of interpolate_images_and_save, in place and strip by strip
+    upscaled_image_importance       = 1 - starting_image_importance
+    starting_height, starting_width = get_image_resolution(starting_image)
+    target_height, target_width     = get_image_resolution(upscaled_image)
+    interpolation = INTER_AREA if starting_height + starting_width > target_height + target_width else INTER_LINEAR
+
+    starting_channels = 3 if starting_image.ndim == 2 else starting_image.shape[2]
+    if starting_channels != upscaled_image.shape[2] or starting_image.dtype != upscaled_image.dtype: return
+
+    strip_rows = calculate_strip_rows(upscaled_image)
+    for strip_start in range(0, target_height, strip_rows):
+        strip_end      = min(strip_start + strip_rows, target_height)
+        starting_strip = resize_image_region(starting_image, strip_start, strip_end, 0, target_width, target_height, target_width, interpolation)
+        if starting_strip.ndim == 2: starting_strip = opencv_cvtColor(starting_strip, COLOR_GRAY2BGR)
+
+        upscaled_strip = upscaled_image[strip_start:strip_end]
+        opencv_addWeighted(starting_strip, starting_image_importance, upscaled_strip, upscaled_image_importance, 0, dst = upscaled_strip)
 
 def update_process_status_videos(
         processing_queue: multiprocessing_Queue, 
@@ -1437,22 +3278,182 @@ def update_process_status_videos(
             percent_complete = (frame_index + 1) / how_many_frames * 100 
             write_process_status(processing_queue, f"{file_number}. Upscaling video {percent_complete:.2f}% ({remaining_time})")
 
-def save_multiple_upscaled_frame_async(
-        starting_frames_to_save: list[numpy_ndarray],
-        upscaled_frames_to_save: list[numpy_ndarray],
-        upscaled_frame_paths_to_save: list[str],
+def save_upscaled_frame(
+        starting_frame: numpy_ndarray,
+        upscaled_frame: numpy_ndarray,
+        upscaled_frame_path: str,
         selected_interpolation_factor: float
     ) -> None:
 
-    for frame_index, _ in enumerate(upscaled_frames_to_save):
-        starting_frame      = starting_frames_to_save[frame_index]        
-        upscaled_frame      = upscaled_frames_to_save[frame_index]
-        upscaled_frame_path = upscaled_frame_paths_to_save[frame_index]
+    if selected_interpolation_factor > 0:
+        interpolate_images_and_save(upscaled_frame_path, starting_frame, upscaled_frame, selected_interpolation_factor)
+    else:
+        image_write(upscaled_frame_path, upscaled_frame)
+
+class HeldFramesDetector:
+
+    # Every thread compares its frames with the last frame it upscaled (the reference), 
+    # slow changes accumulate until the difference is over the threshold and a new reference is upscaled
+
+    def __init__(self, threshold: float):
+        self.threshold      = threshold
+        self.references     = threading_local()
+        self.counters_lock  = Lock()
+        self.checked_frames = 0
+        self.held_frames    = 0
+
+    def calculate_thumbnail(self, frame: numpy_ndarray) -> numpy_ndarray:
+        height, width    = get_image_resolution(frame)
+        thumbnail_width  = min(width, HELD_FRAMES_THUMBNAIL_WIDTH)
+        thumbnail_height = max(round(height * thumbnail_width / width), 1)
+        return opencv_resize(frame, (thumbnail_width, thumbnail_height), interpolation = INTER_AREA)
+
+    def is_held_frame(self, frame: numpy_ndarray) -> bool:
+        thumbnail           = self.calculate_thumbnail(frame)
+        reference_thumbnail = getattr(self.references, "thumbnail", None)
+
+        is_held = (
+            reference_thumbnail is not None 
+            and reference_thumbnail.shape == thumbnail.shape 
+            and numpy_max(opencv_absdiff(reference_thumbnail, thumbnail)) <= self.threshold
+        )
+        if not is_held: self.references.thumbnail = thumbnail
+
+        with self.counters_lock:
+            self.checked_frames += 1
+            self.held_frames    += int(is_held)
 
-        if selected_interpolation_factor > 0:
-            interpolate_images_and_save(upscaled_frame_path, starting_frame, upscaled_frame, selected_interpolation_factor)
-        else:
-            image_write(upscaled_frame_path, upscaled_frame)
+        return is_held
+
+    def set_reference_output(self, upscaled_frame: numpy_ndarray) -> None:
+        self.references.upscaled_frame = upscaled_frame
+
+    def get_reference_output(self) -> numpy_ndarray:
+        return self.references.upscaled_frame
+
+    def print_summary(self) -> None:
+        if self.checked_frames > 0:
+            print(f" Held frames: {self.held_frames}/{self.checked_frames} ({self.held_frames / self.checked_frames * 100:.1f}%) reused the previous upscaled frame")
+
+class StaticTilesDetector:
+
+    # Frames given in order by a single thread, every tile compared with the tile last upscaled 
+    # at the same position (the reference); a tile is upscaled again only when its difference is over the threshold
+
+    def __init__(self, threshold: float):
+        self.threshold       = threshold
+        self.tiles_positions = None
+        self.thumbnails      = None
+        self.upscaled_tiles  = None
+        self.checked_tiles   = 0
+        self.reused_tiles    = 0
+
+    def calculate_thumbnail(self, tile: numpy_ndarray) -> numpy_ndarray:
+        return opencv_resize(tile, (STATIC_TILES_THUMBNAIL_SIZE, STATIC_TILES_THUMBNAIL_SIZE), interpolation = INTER_AREA)
+
+    def find_static_tiles(self, tiles_positions: list[tuple], tiles: list[numpy_ndarray]) -> tuple[list[bool], list[numpy_ndarray]]:
+        thumbnails = [self.calculate_thumbnail(tile) for tile in tiles]
+
+        # Different tiles grid (new video, tiles resolution reduced after out of memory), every tile changed
+        same_tiles_grid = self.tiles_positions == tiles_positions and self.thumbnails[0].shape == thumbnails[0].shape
+
+        static_tiles = [
+            same_tiles_grid and numpy_max(opencv_absdiff(reference, thumbnail)) <= self.threshold 
+            for reference, thumbnail in zip(self.thumbnails if same_tiles_grid else thumbnails, thumbnails)
+        ]
+
+        return static_tiles, thumbnails
+
+    def get_upscaled_tile(self, tile_index: int) -> numpy_ndarray:
+        return self.upscaled_tiles[tile_index]
+
+    def update_references(
+            self, 
+            tiles_positions: list[tuple], 
+            thumbnails: list[numpy_ndarray], 
+            static_tiles: list[bool], 
+            upscaled_tiles: list[numpy_ndarray]
+            ) -> None:
+
+        # Static tiles keep their reference, slow changes accumulate until over the threshold
+        if self.tiles_positions == tiles_positions:
+            thumbnails = [reference if is_static else thumbnail for reference, thumbnail, is_static in zip(self.thumbnails, thumbnails, static_tiles)]
+
+        self.tiles_positions = tiles_positions
+        self.thumbnails      = thumbnails
+        self.upscaled_tiles  = upscaled_tiles
+        self.checked_tiles  += len(static_tiles)
+        self.reused_tiles   += sum(static_tiles)
+
+    def print_summary(self) -> None:
+        if self.checked_tiles > 0:
+            print(f" Static tiles: {self.reused_tiles}/{self.checked_tiles} ({self.reused_tiles / self.checked_tiles * 100:.1f}%) reused from the previous upscaled frames")
+
+class FramesWriterPool:
+
+    # Upscaled frames saved by a fixed number of writer threads from a bounded queue,
+    # upscaling threads wait when the queue is full (disk slower than AI) instead of piling frames in memory
+
+    def __init__(self, selected_interpolation_factor: float, writers_number: int = FRAMES_WRITERS_NUMBER, queue_size: int = FRAMES_WRITER_QUEUE_SIZE):
+        self.selected_interpolation_factor = selected_interpolation_factor
+        self.frames_queue = queue_Queue(maxsize = queue_size)
+        self.metrics_lock = Lock()
+        self.exception    = None
+
+        # Queue depth sampled at every submitted frame
+        self.submitted_frames  = 0
+        self.queue_depth_total = 0
+        self.queue_depth_max   = 0
+        self.waiting_time      = 0
+
+        self.writers = [Thread(target = self._write_frames, daemon = True) for _ in range(writers_number)]
+        for writer in self.writers: writer.start()
+
+    def _write_frames(self) -> None:
+        while True:
+            frame_to_save = self.frames_queue.get()
+            try:
+                if frame_to_save == None: return
+                if self.exception == None: save_upscaled_frame(*frame_to_save, self.selected_interpolation_factor)
+            except Exception as exception:
+                self.exception = self.exception or exception
+            finally:
+                self.frames_queue.task_done()
+
+    def submit(
+            self, 
+            starting_frame: numpy_ndarray, 
+            upscaled_frame: numpy_ndarray, 
+            upscaled_frame_path: str
+            ) -> None:
+        
+        if self.exception != None: raise self.exception
+
+        start_timer = timer()
+        self.frames_queue.put((starting_frame, upscaled_frame, upscaled_frame_path))
+        waiting_time = timer() - start_timer
+
+        with self.metrics_lock:
+            queue_depth = self.frames_queue.qsize()
+            self.submitted_frames  += 1
+            self.queue_depth_total += queue_depth
+            self.queue_depth_max    = max(self.queue_depth_max, queue_depth)
+            self.waiting_time      += waiting_time
+
+    def flush(self) -> None:
+        # Barrier, every submitted frame is on disk
+        self.frames_queue.join()
+        if self.exception != None: raise self.exception
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            for _ in self.writers: self.frames_queue.put(None)
+            for writer in self.writers: writer.join()
+
+        if self.submitted_frames > 0:
+            print(f" Frames writer queue depth: average {self.queue_depth_total / self.submitted_frames:.1f} • max {self.queue_depth_max}/{self.frames_queue.maxsize} • upscaling waited {self.waiting_time:.2f}s for the disk")
 
 
 
@@ -1497,8 +3498,20 @@ def write_process_status(
         ) -> None:
     
     print(f"{step}")
-    while not processing_queue.empty(): processing_queue.get()
-    processing_queue.put(f"{step}")
+
+    # Only the last status kept, never blocking: the previous one can be still 
+    # in flight (multiprocessing feeder thread) or written by another thread
+    while True:
+        try:
+            processing_queue.get_nowait()
+        except queue_Empty:
+            pass
+
+        try:
+            processing_queue.put_nowait(f"{step}")
+            return
+        except queue_Full:
+            sleep(0.01)
 
 def stop_upscale_process() -> None:
     global process_upscale_orchestrator
@@ -1522,6 +3535,7 @@ def upscale_button_command() -> None:
     global selected_interpolation_factor
     global selected_image_extension
     global selected_video_extension
+    global selected_AI_precision
     global tiles_resolution
     global resize_factor
     global cpu_number
@@ -1537,6 +3551,7 @@ def upscale_button_command() -> None:
         print(f"  Output path: {(selected_output_path.get())}")
         print(f"  Selected AI model: {selected_AI_model}")
         print(f"  Selected GPU: {selected_gpu}")
+        print(f"  AI precision: {selected_AI_precision}")
         print(f"  AI multithreading: {selected_AI_multithreading}")
         print(f"  Interpolation factor: {selected_interpolation_factor}")
         print(f"  Selected image output extension: {selected_image_extension}")
@@ -1565,7 +3580,8 @@ def upscale_button_command() -> None:
                 selected_interpolation_factor,
                 selected_AI_multithreading,
                 selected_keep_frames
-            )
+            ),
+            kwargs = { "selected_AI_precision": selected_AI_precision }
         )
         process_upscale_orchestrator.start()
 
@@ -1575,6 +3591,91 @@ def upscale_button_command() -> None:
 
 # ORCHESTRATOR
 
+def load_AI_sessions(
+        selected_AI_model: str,
+        selected_gpu: str,
+        resize_factor: int,
+        tiles_resolution: int,
+        cpu_number: int,
+        session_settings: dict,
+        selected_AI_precision: str,
+        tile_size: int,
+        tiles_workers: int,
+        output_ram_budget: float,
+        AI_sessions_number: int,
+        selected_AI_multithreading: int,
+        warmup_resolution: tuple | None,
+        first_file_is_video: bool
+        ) -> list[AI]:
+
+    remove_stale_memory_mapped_files()
+
+    AI_instance = AI(selected_AI_model, selected_gpu, resize_factor, tiles_resolution, cpu_number, session_settings, selected_AI_precision, tile_size, tiles_workers, output_ram_budget)
+
+    # Tiles settings not selected, calibrated ones for this machine if available
+    autotuned_settings = get_autotuned_tiles_settings(AI_instance)
+    if autotuned_settings != None:
+        tile_size     = tile_size     or autotuned_settings["tile_size"]
+        tiles_workers = tiles_workers or min(autotuned_settings["tiles_workers"], max(cpu_number, 1))
+        AI_instance.set_tiles_settings(tile_size, tiles_workers)
+        print(f" Autotuned tiles: {AI_instance.tile_size}px • {AI_instance.tiles_workers} workers")
+
+    # Sessions pool, 0 = one shared session when the provider supports concurrent runs, else one session for each thread
+    if AI_sessions_number <= 0:
+        AI_sessions_number = selected_AI_multithreading if AI_instance.inference_lock != None else 1
+    AI_sessions_number = max(min(AI_sessions_number, selected_AI_multithreading), 1)
+
+    # Other sessions loaded in parallel, model files already converted/cached by the first one
+    create_AI_session = lambda _: AI(selected_AI_model, selected_gpu, resize_factor, tiles_resolution, cpu_number, session_settings, selected_AI_precision, tile_size, tiles_workers, output_ram_budget)
+    AI_sessions_list  = [AI_instance]
+    if AI_sessions_number > 1:
+        with ThreadPool(AI_sessions_number - 1) as pool:
+            AI_sessions_list.extend(pool.map(create_AI_session, range(AI_sessions_number - 1)))
+
+    for AI_session in AI_sessions_list:
+        AI_session.pooled_sessions    = AI_sessions_list
+        AI_session.out_of_memory_lock = AI_instance.out_of_memory_lock
+
+    # Warmup of every session at the inference shape of the first file, the first session on 
+    # the calling thread (the one upscaling the files) or its tiles workers, the others in parallel
+    if warmup_resolution != None:
+        warmup_shape = AI_instance.calculate_warmup_shape(*warmup_resolution, first_file_is_video)
+        with ThreadPool(max(len(AI_sessions_list) - 1, 1)) as pool:
+            other_warmups = pool.map_async(lambda AI_session: AI_session.AI_warmup(*warmup_shape), AI_sessions_list[1:])
+            AI_instance.AI_warmup(*warmup_shape)
+            other_warmups.wait()
+
+    return AI_sessions_list
+
+def prepare_first_file(
+        processing_queue: multiprocessing_Queue,
+        file_path: str,
+        file_is_video: bool,
+        selected_output_path: str,
+        selected_AI_model: str,
+        resize_factor: int,
+        cpu_number: int,
+        selected_interpolation_factor: float,
+        output_ram_budget: float,
+        video_streaming: bool = False
+        ) -> list[str] | numpy_ndarray | None:
+
+    # Video frames extracted (streamed videos are decoded while upscaling),
+    # image decoded only when surely upscaled in RAM (not region by region)
+    if file_is_video and video_streaming:
+        return None
+    elif file_is_video:
+        return prepare_video_frames(processing_queue, file_path, 1, selected_output_path, selected_AI_model, resize_factor, cpu_number, selected_interpolation_factor)
+
+    image_resolution = get_file_resolution(file_path)
+    if image_resolution == None: return None
+
+    height, width     = image_resolution
+    max_target_pixels = int(height * resize_factor) * int(width * resize_factor) * MAX_UPSCALE_FACTOR * MAX_UPSCALE_FACTOR
+    if output_ram_budget > 0 and max_target_pixels * 3 > output_ram_budget * 1024**3: return None
+
+    return image_read(file_path)
+
 def upscale_orchestrator(
         processing_queue: multiprocessing_Queue,
         selected_file_list: list,
@@ -1588,25 +3689,131 @@ def upscale_orchestrator(
         selected_video_extension: str,
         selected_interpolation_factor: float,
         selected_AI_multithreading: int,
-        selected_keep_frames: bool
+        selected_keep_frames: bool,
+        session_settings: dict = None,
+        AI_sessions_number: int = 0,
+        selected_AI_precision: str = "Auto",
+        tile_size: int = 0,
+        tiles_workers: int = 0,
+        output_ram_budget: float = OUTPUT_RAM_BUDGET_GB,
+        AI_warmup: bool = True,
+        video_streaming: bool = False,
+        video_resume_journal: bool = False,
+        video_encoding_settings: dict = None,
+        held_frames_threshold: float = None,
+        static_tiles_threshold: float = None
         ) -> None:
 
-    write_process_status(processing_queue, f"Loading AI model")
-    AI_instance = AI(selected_AI_model, selected_gpu, resize_factor, tiles_resolution)
-    AI_instance_list = []
-    AI_instance_list.append(AI_instance)
+    job_start_time = timer()
+    write_process_status(processing_queue, f"Loading AI model")
+
+    # First file probed and decoded/extracted in background while the AI sessions are 
+    # loaded (and warmed up) on this thread, the one running the inference of the files
+    first_file_path     = selected_file_list[0]
+    first_file_is_video = check_if_file_is_video(first_file_path)
+    warmup_resolution   = get_file_resolution(first_file_path) if AI_warmup else None
+    AI_loading          = SimpleNamespace(AI_sessions_list = None, time = 0)
+    first_file          = SimpleNamespace(data = None, exception = None, time = 0)
+
+    def prepare_first_file_async() -> None:
+        try:
+            first_file.data = prepare_first_file(
+                processing_queue, 
+                first_file_path, 
+                first_file_is_video, 
+                selected_output_path, 
+                selected_AI_model, 
+                resize_factor, 
+                cpu_number, 
+                selected_interpolation_factor, 
+                output_ram_budget,
+                video_streaming
+            )
+        except Exception as exception:
+            first_file.exception = exception
+        first_file.time = timer() - job_start_time
+
+    first_file_thread = Thread(target = prepare_first_file_async)
+    first_file_thread.start()
+
+    # Small images collected and upscaled together in few session runs
+    images_batch = []
+
+    def upscale_collected_images() -> None:
+        if len(images_batch) == 0: return
+        upscale_images_batch(
+            processing_queue,
+            images_batch,
+            selected_output_path,
+            AI_instance,
+            selected_AI_model,
+            selected_image_extension,
+            resize_factor,
+            selected_interpolation_factor
+        )
+        images_batch.clear()
+
+    try:
+        try:
+            AI_loading.AI_sessions_list = load_AI_sessions(
+                selected_AI_model, 
+                selected_gpu, 
+                resize_factor, 
+                tiles_resolution, 
+                cpu_number, 
+                session_settings, 
+                selected_AI_precision, 
+                tile_size, 
+                tiles_workers, 
+                output_ram_budget,
+                AI_sessions_number,
+                selected_AI_multithreading,
+                warmup_resolution,
+                first_file_is_video
+            )
+            AI_loading.time = timer() - job_start_time
+        finally:
+            first_file_thread.join()
+
+        if first_file.exception != None: raise first_file.exception
+
+        print(f" AI sessions ready in {AI_loading.time:.2f}s • first file prepared in {first_file.time:.2f}s (overlapped)")
 
-    if selected_AI_multithreading > 1:
-        for _ in range(selected_AI_multithreading - 1):
-            AI_instance_list.append(AI(selected_AI_model, selected_gpu, resize_factor, tiles_resolution))
+        first_file_data = first_file.data
+        AI_sessions_list = AI_loading.AI_sessions_list
+        AI_instance      = AI_sessions_list[0]
+        AI_instance_list = [AI_sessions_list[thread_index % len(AI_sessions_list)] for thread_index in range(selected_AI_multithreading)]
+
+        # Time to first output measured from the job start
+        for AI_session in AI_sessions_list: AI_session.session_start_time = job_start_time
 
-    try:
         how_many_files = len(selected_file_list)
         for file_number in range(how_many_files):
             file_path   = selected_file_list[file_number]
             file_number = file_number + 1
 
-            if check_if_file_is_video(file_path):
+            if check_if_file_is_video(file_path) and video_streaming:
+                upscale_collected_images()
+                upscale_video_streaming(
+                    processing_queue,
+                    file_path, 
+                    file_number,
+                    selected_output_path, 
+                    AI_instance,
+                    AI_instance_list,
+                    selected_AI_model,
+                    resize_factor, 
+                    cpu_number, 
+                    selected_video_extension, 
+                    selected_interpolation_factor,
+                    selected_AI_multithreading,
+                    video_resume_journal,
+                    video_encoding_settings,
+                    held_frames_threshold,
+                    static_tiles_threshold
+                )
+            elif check_if_file_is_video(file_path):
+                upscale_collected_images()
                 upscale_video(
                     processing_queue,
                     file_path, 
@@ -1620,8 +3827,15 @@ def upscale_orchestrator(
                     selected_video_extension, 
                     selected_interpolation_factor,
                     selected_AI_multithreading,
-                    selected_keep_frames
+                    selected_keep_frames,
+                    first_file_data if file_number == 1 else None,
+                    video_encoding_settings,
+                    held_frames_threshold,
+                    static_tiles_threshold
                 )
+            elif use_images_batch(file_path, AI_instance):
+                images_batch.append((file_number, file_path))
+                if len(images_batch) == MAX_IMAGES_BATCH: upscale_collected_images()
             else:
                 upscale_image(
                     processing_queue,
@@ -1632,13 +3846,18 @@ def upscale_orchestrator(
                     selected_AI_model,
                     selected_image_extension, 
                     resize_factor, 
-                    selected_interpolation_factor
+                    selected_interpolation_factor,
+                    first_file_data if file_number == 1 else None
                 )
 
+        upscale_collected_images()
+
         write_process_status(processing_queue, f"{COMPLETED_STATUS}")
 
     except Exception as exception:
         write_process_status(processing_queue, f"{ERROR_STATUS} {str(exception)}")
+    finally:
+        for AI_session in AI_loading.AI_sessions_list or []: AI_session.close_tiles_pool()
 
 # IMAGES
 
@@ -1651,22 +3870,78 @@ def upscale_image(
         selected_AI_model: str,
         selected_image_extension: str,
         resize_factor: int, 
-        selected_interpolation_factor: float
+        selected_interpolation_factor: float,
+        starting_image: numpy_ndarray = None
         ) -> None:
     
-    starting_image = image_read(image_path)
     upscaled_image_path = prepare_output_image_filename(image_path, selected_output_path, selected_AI_model, resize_factor, selected_image_extension, selected_interpolation_factor)
 
+    # Very large images are read region by region from a memory-mapped copy
+    image_reader = ImageRegionReader(image_path, AI_instance.resize_factor) if use_image_region_reader(image_path, AI_instance) else None
+
+    # Tiles checkpoint, used only by images with many tiles
+    tiles_checkpoint = prepare_tiles_checkpoint(image_path, upscaled_image_path, AI_instance)
+
+    canvas_path = None
+
     write_process_status(processing_queue, f"{file_number}. Upscaling image")
-    upscaled_image = AI_instance.AI_orchestration(starting_image)
+    try:
+        if image_reader != None:
+            starting_image = image_reader.source
+            upscaled_image = AI_instance.AI_orchestration_region_reader(image_reader, tiles_checkpoint)
+        else:
+            # Already decoded for the first file while the AI was loading
+            if starting_image is None: starting_image = image_read(image_path)
+            upscaled_image = AI_instance.AI_orchestration(starting_image, tiles_checkpoint, shape_bucketing = True)
+
+        if isinstance(upscaled_image, numpy_memmap):
+            canvas_path = upscaled_image.filename
+            if selected_interpolation_factor > 0:
+                interpolate_images_out_of_core(starting_image, upscaled_image, selected_interpolation_factor)
+            image_write_out_of_core(upscaled_image_path, upscaled_image, selected_image_extension)
+
+        elif selected_interpolation_factor > 0:
+            interpolate_images_and_save(upscaled_image_path, starting_image, upscaled_image, selected_interpolation_factor, selected_image_extension)
+        else:
+            image_write(upscaled_image_path, upscaled_image, selected_image_extension)
+    finally:
+        # Memory-mapped files unmapped and removed also when the upscale fails
+        starting_image = upscaled_image = None
+        if canvas_path != None: remove_output_canvas(canvas_path)
+        if image_reader != None: image_reader.close()
 
-    if selected_interpolation_factor > 0:
-        interpolate_images_and_save(upscaled_image_path, starting_image, upscaled_image, selected_interpolation_factor, selected_image_extension)
-    else:
-        image_write(upscaled_image_path, upscaled_image, selected_image_extension)
+    tiles_checkpoint.remove()
 
     copy_file_metadata(image_path, upscaled_image_path)
 
+def upscale_images_batch(
+        processing_queue: multiprocessing_Queue,
+        images_batch: list[tuple],
+        selected_output_path: str,
+        AI_instance: AI,
+        selected_AI_model: str,
+        selected_image_extension: str,
+        resize_factor: int,
+        selected_interpolation_factor: float
+        ) -> None:
+
+    first_file_number, _ = images_batch[0]
+    last_file_number, _  = images_batch[-1]
+
+    write_process_status(processing_queue, f"{first_file_number}-{last_file_number}. Upscaling {len(images_batch)} images")
+    starting_images = [image_read(image_path) for _, image_path in images_batch]
+    upscaled_images = AI_instance.AI_orchestration_images_batch(starting_images)
+
+    for (_, image_path), starting_image, upscaled_image in zip(images_batch, starting_images, upscaled_images):
+        upscaled_image_path = prepare_output_image_filename(image_path, selected_output_path, selected_AI_model, resize_factor, selected_image_extension, selected_interpolation_factor)
+
+        if selected_interpolation_factor > 0:
+            interpolate_images_and_save(upscaled_image_path, starting_image, upscaled_image, selected_interpolation_factor, selected_image_extension)
+        else:
+            image_write(upscaled_image_path, upscaled_image, selected_image_extension)
+
+        copy_file_metadata(image_path, upscaled_image_path)
+
 # VIDEOS
 
 def upscale_video(
@@ -1682,7 +3957,11 @@ def upscale_video(
         selected_video_extension: str,
         selected_interpolation_factor: float,
         selected_AI_multithreading: int,
-        selected_keep_frames: bool
+        selected_keep_frames: bool,
+        extracted_frames_paths: list[str] = None,
+        video_encoding_settings: dict = None,
+        held_frames_threshold: float = None,
+        static_tiles_threshold: float = None
         ) -> None:
 
     global processed_frames_index_async
@@ -1694,132 +3973,371 @@ def upscale_video(
     target_directory  = prepare_output_video_directory_name(video_path, selected_output_path, selected_AI_model, resize_factor, selected_interpolation_factor)
     video_output_path = prepare_output_video_filename(video_path, selected_output_path, selected_AI_model, resize_factor, selected_video_extension, selected_interpolation_factor)
     
-    # 2. Resume upscaling OR Video frames extraction
-    video_upscale_continue = check_video_upscaling_resume(target_directory, selected_AI_model)
-    if video_upscale_continue:
-        write_process_status(processing_queue, f"{file_number}. Resume video upscaling")
-        extracted_frames_paths = get_video_frames_for_upscaling_resume(target_directory, selected_AI_model)
-        write_process_status(processing_queue, f"{file_number}. Resume video upscaling ({len(extracted_frames_paths)} frames)")
-    else:
-        write_process_status(processing_queue, f"{file_number}. Extracting video frames")
-        extracted_frames_paths = extract_video_frames(processing_queue, file_number, target_directory, video_path, cpu_number)
-        write_process_status(processing_queue, f"{file_number}. Video upscaling ({len(extracted_frames_paths)} frames)")
+    # 2. Resume upscaling OR Video frames extraction (already done for the first file while the AI was loading)
+    if extracted_frames_paths == None:
+        extracted_frames_paths = prepare_video_frames(processing_queue, video_path, file_number, selected_output_path, selected_AI_model, resize_factor, cpu_number, selected_interpolation_factor)
 
     upscaled_frame_paths = [prepare_output_video_frame_filename(frame_path, selected_AI_model, resize_factor, selected_interpolation_factor) for frame_path in extracted_frames_paths]
 
-    # 3. Check if video need tiles OR video multithreading upscale
+    # 3. Check if video need tiles OR video batch upscale OR video multithreading upscale
     first_frame_path             = extracted_frames_paths[0]
     video_need_tiles             = AI_instance.video_need_tilling(first_frame_path)
     multiframes_supported_by_gpu = AI_instance.calculate_multiframes_supported_by_gpu(first_frame_path)
     multiframes_number           = min(multiframes_supported_by_gpu, selected_AI_multithreading)
+    frames_batch_size            = AI_instance.calculate_frames_batch_size(first_frame_path)
+
+    # Upscaled frames saved by the writers pool, all of them on disk before the encoding
+    frames_writer_pool    = FramesWriterPool(selected_interpolation_factor)
+    held_frames_detector  = HeldFramesDetector(held_frames_threshold) if held_frames_threshold != None else None
+    static_tiles_detector = StaticTilesDetector(static_tiles_threshold) if static_tiles_threshold != None else None
 
     write_process_status(processing_queue, f"{file_number}. Upscaling video") 
-    if video_need_tiles or multiframes_number <= 1:
-        upscale_video_frames(
-            processing_queue,
-            file_number,
-            AI_instance,
-            extracted_frames_paths,
-            upscaled_frame_paths,
-            selected_interpolation_factor
-        )
-    else:
-        upscale_video_frames_multithreading(
-            processing_queue,
-            file_number,
-            AI_instance_list,
-            extracted_frames_paths,
-            upscaled_frame_paths,
-            multiframes_number,
-            selected_interpolation_factor
-        )
+    try:
+        if not video_need_tiles and frames_batch_size > 1:
+            upscale_video_frames(
+                processing_queue,
+                file_number,
+                AI_instance,
+                extracted_frames_paths,
+                upscaled_frame_paths,
+                frames_writer_pool,
+                frames_batch_size,
+                held_frames_detector,
+                static_tiles_detector
+            )
+        elif video_need_tiles or multiframes_number <= 1 or static_tiles_detector != None:
+            # Static tiles compared with the previous frame, frames upscaled in order by one thread
+            upscale_video_frames(
+                processing_queue,
+                file_number,
+                AI_instance,
+                extracted_frames_paths,
+                upscaled_frame_paths,
+                frames_writer_pool,
+                held_frames_detector  = held_frames_detector,
+                static_tiles_detector = static_tiles_detector
+            )
+        else:
+            upscale_video_frames_multithreading(
+                processing_queue,
+                file_number,
+                AI_instance_list,
+                extracted_frames_paths,
+                upscaled_frame_paths,
+                multiframes_number,
+                frames_writer_pool,
+                held_frames_detector
+            )
+
+        # 4. Check for forgotten video frames
+        check_forgotten_video_frames(processing_queue, file_number, AI_instance, extracted_frames_paths, upscaled_frame_paths, frames_writer_pool, held_frames_detector, static_tiles_detector)
+    finally:
+        frames_writer_pool.close()
 
-    # 4. Check for forgotten video frames
-    check_forgotten_video_frames(processing_queue, file_number, AI_instance, extracted_frames_paths, upscaled_frame_paths, selected_interpolation_factor)
+    if held_frames_detector  != None: held_frames_detector.print_summary()
+    if static_tiles_detector != None: static_tiles_detector.print_summary()
 
     # 5. Video encoding
     write_process_status(processing_queue, f"{file_number}. Encoding upscaled video")
-    video_encoding(video_path, video_output_path, upscaled_frame_paths, cpu_number, selected_video_extension)
+    video_no_audio_path = prepare_video_no_audio_path(video_output_path)
+    video_encoding(video_path, video_no_audio_path, upscaled_frame_paths, cpu_number, selected_video_extension, video_encoding_settings)
+    video_audio_passthrough(video_path, video_no_audio_path, video_output_path)
     copy_file_metadata(video_path, video_output_path)
 
     # 6. Delete frames folder
     if selected_keep_frames == False: 
         if os_path_exists(target_directory): remove_directory(target_directory)
 
+def upscale_video_streaming(
+        processing_queue: multiprocessing_Queue,
+        video_path: str, 
+        file_number: int,
+        selected_output_path: str,
+        AI_instance: AI,
+        AI_instance_list: list[AI],
+        selected_AI_model: str,
+        resize_factor: int, 
+        cpu_number: int, 
+        selected_video_extension: str,
+        selected_interpolation_factor: float,
+        selected_AI_multithreading: int,
+        video_resume_journal: bool,
+        video_encoding_settings: dict = None,
+        held_frames_threshold: float = None,
+        static_tiles_threshold: float = None
+        ) -> None:
+
+    # Frames decoded ➜ upscaled ➜ piped to ffmpeg, bounded queues between the stages 
+    # and no frame files on disk (only the encoded segments of the resume journal)
+
+    # 1.Preparation
+    video_output_path   = prepare_output_video_filename(video_path, selected_output_path, selected_AI_model, resize_factor, selected_video_extension, selected_interpolation_factor)
+    video_no_audio_path = prepare_video_no_audio_path(video_output_path)
+    video_fps           = get_video_fps(video_path)
+    encoding_settings   = get_video_encoding_settings(selected_video_extension, video_encoding_settings)
+    video_journal       = prepare_video_journal(video_path, video_output_path, AI_instance, selected_video_extension, selected_interpolation_factor, encoding_settings, held_frames_threshold, static_tiles_threshold) if video_resume_journal else None
+    completed_frames    = video_journal.get_completed_frames() if video_journal != None else 0
+
+    video_capture   = opencv_VideoCapture(video_path)
+    total_frames    = int(video_capture.get(CAP_PROP_FRAME_COUNT))
+    decoded_frames  = queue_Queue(maxsize = STREAMING_QUEUE_FRAMES)
+    upscaled_frames = queue_Queue(maxsize = STREAMING_QUEUE_FRAMES)
+    pipeline        = SimpleNamespace(stop = Event(), decoding_done = False, exception = None)
+    held_frames_detector  = HeldFramesDetector(held_frames_threshold) if held_frames_threshold != None else None
+    static_tiles_detector = StaticTilesDetector(static_tiles_threshold) if static_tiles_threshold != None else None
+
+    if completed_frames > 0:
+        write_process_status(processing_queue, f"{file_number}. Resume video upscaling from frame {completed_frames + 1}")
+
+    # 2. Decoder and encoder threads
+    def decode_frames() -> None:
+        try:
+            # Frames already in the journal segments skipped without retrieving them
+            for _ in range(completed_frames): video_capture.grab()
+
+            while not pipeline.stop.is_set():
+                success, frame = video_capture.read()
+                if not success: break
+                decoded_frames.put(frame)
+        except Exception as exception:
+            pipeline.exception = exception
+        finally:
+            video_capture.release()
+            decoded_frames.put(None)
+
+    def encode_frames() -> None:
+        video_encoder  = None
+        segment_path   = None
+        segment_frames = 0
+
+        while True:
+            upscaled_frame = upscaled_frames.get()
+            if upscaled_frame is None: break
+            if pipeline.exception != None: continue
+
+            try:
+                if video_encoder == None:
+                    height, width = get_image_resolution(upscaled_frame)
+                    # Video stream only, the audio is muxed after the last frame
+                    segment_path  = video_journal.start_segment() if video_journal != None else video_no_audio_path
+                    video_encoder = VideoEncoder(segment_path, width, height, video_fps, encoding_settings, cpu_number)
+
+                video_encoder.write(upscaled_frame)
+                segment_frames += 1
+
+                # Segment completed, saved in the journal
+                if video_journal != None and segment_frames == STREAMING_SEGMENT_FRAMES:
+                    video_encoder.close()
+                    video_journal.add_segment(segment_path, segment_frames)
+                    video_encoder  = None
+                    segment_frames = 0
+            except Exception as exception:
+                pipeline.exception = exception
+
+        if video_encoder != None:
+            try:
+                video_encoder.close()
+                if video_journal != None and pipeline.exception == None and pipeline.decoding_done: 
+                    video_journal.add_segment(segment_path, segment_frames)
+            except Exception as exception:
+                pipeline.exception = pipeline.exception or exception
+
+    def read_decoded_frames(frames_number: int) -> list[numpy_ndarray]:
+        frames = []
+        while len(frames) < frames_number and not pipeline.decoding_done:
+            frame = decoded_frames.get()
+            if frame is None: 
+                pipeline.decoding_done = True
+            else:
+                frames.append(frame)
+        return frames
+
+    def upscale_frames(AI_session: AI, frames: list[numpy_ndarray]) -> list[numpy_ndarray]:
+        if static_tiles_detector != None:
+            return [AI_session.AI_orchestration_reusing_static_tiles(frame, static_tiles_detector) for frame in frames]
+        elif len(frames) > 1:
+            return AI_session.AI_orchestration_batch(frames)
+        else:
+            return [AI_session.AI_orchestration(frames[0])]
+
+    decoder_thread = Thread(target = decode_frames, daemon = True)
+    encoder_thread = Thread(target = encode_frames, daemon = True)
+    decoder_thread.start()
+    encoder_thread.start()
+
+    # 3. Frames upscaled in rounds of batches, one batch for each thread, written in order in the encoder queue
+    upscaling_completed = False
+    try:
+        pending_frames = read_decoded_frames(1)
+        if len(pending_frames) > 0:
+            first_frame                  = pending_frames[0]
+            video_need_tiles             = AI_instance.video_need_tilling(first_frame)
+            frames_batch_size            = AI_instance.calculate_frames_batch_size(first_frame) if not video_need_tiles else 1
+            multiframes_supported_by_gpu = AI_instance.calculate_multiframes_supported_by_gpu(first_frame)
+            single_thread                = video_need_tiles or frames_batch_size > 1 or static_tiles_detector != None
+            threads_number               = 1 if single_thread else max(min(multiframes_supported_by_gpu, selected_AI_multithreading), 1)
+
+            write_process_status(processing_queue, f"{file_number}. Upscaling video (streaming, {threads_number} threads)")
+
+            frame_index            = completed_frames
+            frame_processing_times = []
+
+            with ThreadPool(threads_number) as pool:
+                # A single thread upscales inline, on the thread warmed up with the AI sessions
+                run_batches = pool.starmap if threads_number > 1 else lambda function, arguments: list(itertools_starmap(function, arguments))
+
+                while True:
+                    frames = pending_frames + read_decoded_frames(threads_number * frames_batch_size - len(pending_frames))
+                    pending_frames = []
+                    if len(frames) == 0: break
+
+                    # Held frames excluded from the batches, output of the last upscaled frame reused
+                    start_timer       = timer()
+                    held_frames       = [held_frames_detector.is_held_frame(frame) if held_frames_detector != None else False for frame in frames]
+                    frames_to_upscale = [frame for frame, is_held in zip(frames, held_frames) if not is_held]
+                    frames_batches    = [frames_to_upscale[batch_start:batch_start + frames_batch_size] for batch_start in range(0, len(frames_to_upscale), frames_batch_size)]
+                    upscaled_frames_batches = run_batches(upscale_frames, zip(AI_instance_list, frames_batches))
+                    time_for_frame    = (timer() - start_timer) / len(frames)
+
+                    new_upscaled_frames = (frame for batch in upscaled_frames_batches for frame in batch)
+                    for starting_frame, is_held in zip(frames, held_frames):
+                        if held_frames_detector == None:
+                            upscaled_frame = next(new_upscaled_frames)
+                        else:
+                            if not is_held: held_frames_detector.set_reference_output(next(new_upscaled_frames))
+                            upscaled_frame = held_frames_detector.get_reference_output()
+
+                        if selected_interpolation_factor > 0:
+                            upscaled_frame = interpolate_images(starting_frame, upscaled_frame, selected_interpolation_factor)
+                        upscaled_frames.put(upscaled_frame)
+
+                        frame_processing_times.append(time_for_frame)
+                        update_process_status_videos(processing_queue, file_number, frame_index, total_frames, numpy_mean(frame_processing_times))
+                        frame_index += 1
+                        if frame_index % 100 == 0: frame_processing_times = []
+
+                    if pipeline.exception != None: break
+
+        upscaling_completed = True
+    finally:
+        pipeline.stop.set()
+        while not decoded_frames.empty(): decoded_frames.get_nowait()
+        upscaled_frames.put(None)
+        encoder_thread.join()
+
+        # Truncated video removed on error, the output file is created only from a cleanly closed encoding
+        if not upscaling_completed or pipeline.exception != None:
+            if video_journal == None and os_path_exists(video_no_audio_path): os_remove(video_no_audio_path)
+
+    if pipeline.exception != None: raise pipeline.exception
+
+    if held_frames_detector  != None: held_frames_detector.print_summary()
+    if static_tiles_detector != None: static_tiles_detector.print_summary()
+
+    # 4. Segments joined, then the audio of the original video muxed
+    if video_journal != None:
+        write_process_status(processing_queue, f"{file_number}. Encoding upscaled video")
+        video_journal.concatenate_segments(video_no_audio_path)
+        video_journal.remove()
+
+    video_audio_passthrough(video_path, video_no_audio_path, video_output_path)
+
+    copy_file_metadata(video_path, video_output_path)
+
+def prepare_video_frames(
+        processing_queue: multiprocessing_Queue,
+        video_path: str,
+        file_number: int,
+        selected_output_path: str,
+        selected_AI_model: str,
+        resize_factor: int,
+        cpu_number: int,
+        selected_interpolation_factor: float
+        ) -> list[str]:
+
+    target_directory = prepare_output_video_directory_name(video_path, selected_output_path, selected_AI_model, resize_factor, selected_interpolation_factor)
+
+    video_upscale_continue = check_video_upscaling_resume(target_directory, selected_AI_model)
+    if video_upscale_continue:
+        write_process_status(processing_queue, f"{file_number}. Resume video upscaling")
+        extracted_frames_paths = get_video_frames_for_upscaling_resume(target_directory, selected_AI_model)
+        write_process_status(processing_queue, f"{file_number}. Resume video upscaling ({len(extracted_frames_paths)} frames)")
+    else:
+        write_process_status(processing_queue, f"{file_number}. Extracting video frames")
+        extracted_frames_paths = extract_video_frames(processing_queue, file_number, target_directory, video_path, cpu_number)
+        write_process_status(processing_queue, f"{file_number}. Video upscaling ({len(extracted_frames_paths)} frames)")
+
+    return extracted_frames_paths
+
+def upscale_video_frames_skipping_held(
+        AI_instance: AI,
+        starting_frames: list[numpy_ndarray],
+        held_frames_detector: "HeldFramesDetector" = None,
+        static_tiles_detector: "StaticTilesDetector" = None
+        ) -> list[numpy_ndarray]:
+
+    # Consecutive frames, held ones reuse the output of the last upscaled frame
+    # and the others only upscale their tiles changed since the previous frame
+    held_frames       = [held_frames_detector.is_held_frame(frame) if held_frames_detector != None else False for frame in starting_frames]
+    frames_to_upscale = [frame for frame, is_held in zip(starting_frames, held_frames) if not is_held]
+
+    if static_tiles_detector != None:
+        upscaled_frames = iter([AI_instance.AI_orchestration_reusing_static_tiles(frame, static_tiles_detector) for frame in frames_to_upscale])
+    elif len(frames_to_upscale) > 1:
+        upscaled_frames = iter(AI_instance.AI_orchestration_batch(frames_to_upscale))
+    elif len(frames_to_upscale) == 1:
+        upscaled_frames = iter([AI_instance.AI_orchestration(frames_to_upscale[0])])
+    else:
+        upscaled_frames = iter([])
+
+    if held_frames_detector == None: return list(upscaled_frames)
+
+    output_frames = []
+    for is_held in held_frames:
+        if not is_held: held_frames_detector.set_reference_output(next(upscaled_frames))
+        output_frames.append(held_frames_detector.get_reference_output())
+
+    return output_frames
+
 def upscale_video_frames(
         processing_queue: multiprocessing_Queue,
         file_number: int,
         AI_instance: AI,
         extracted_frames_paths: list[str],
         upscaled_frame_paths: list[str],
-        selected_interpolation_factor: float
+        frames_writer_pool: "FramesWriterPool",
+        frames_batch_size: int = 1,
+        held_frames_detector: "HeldFramesDetector" = None,
+        static_tiles_detector: "StaticTilesDetector" = None
         ) -> None:
     
-    starting_frames_to_save      = []
-    upscaled_frames_to_save      = []
-    upscaled_frame_paths_to_save = []
-
     frame_processing_times = []
 
-    for frame_index in range(len((extracted_frames_paths))):
-        frame_path          = extracted_frames_paths[frame_index]
-        upscaled_frame_path = upscaled_frame_paths[frame_index]
-        already_upscaled    = os_path_exists(upscaled_frame_path)
-        
-        if already_upscaled == False:
-            start_timer = timer()
-            
-            # Upscaling frame
-            starting_frame = image_read(frame_path)
-            upscaled_frame = AI_instance.AI_orchestration(starting_frame)
-
-            # Adding frames in list to save
-            starting_frames_to_save.append(starting_frame)
-            upscaled_frames_to_save.append(upscaled_frame)
-            upscaled_frame_paths_to_save.append(upscaled_frame_path)
-
-            # Save frames in memory
-            if len(upscaled_frame_paths_to_save) == MULTIPLE_FRAMES_TO_SAVE:
-                thread = Thread(
-                    target = save_multiple_upscaled_frame_async,
-                    args = (
-                        starting_frames_to_save,
-                        upscaled_frames_to_save,
-                        upscaled_frame_paths_to_save,
-                        selected_interpolation_factor
-                    )
-                )
-                thread.start()
+    frame_indexes_to_upscale = [frame_index for frame_index in range(len(extracted_frames_paths)) if not os_path_exists(upscaled_frame_paths[frame_index])]
+
+    for batch_start in range(0, len(frame_indexes_to_upscale), frames_batch_size):
+        batch_frame_indexes = frame_indexes_to_upscale[batch_start:batch_start + frames_batch_size]
+        start_timer = timer()
+
+        # Upscaling frames batch, held frames excluded
+        starting_frames   = [image_read(extracted_frames_paths[frame_index]) for frame_index in batch_frame_indexes]
+        upscaled_frames   = upscale_video_frames_skipping_held(AI_instance, starting_frames, held_frames_detector, static_tiles_detector)
+
+        time_for_frame = (timer() - start_timer) / len(batch_frame_indexes)
 
-                starting_frames_to_save = []
-                upscaled_frames_to_save = []
-                upscaled_frame_paths_to_save = []
+        for frame_index, starting_frame, upscaled_frame in zip(batch_frame_indexes, starting_frames, upscaled_frames):
+
+            # Frame saved by the writers, waiting here if the disk is behind
+            frames_writer_pool.submit(starting_frame, upscaled_frame, upscaled_frame_paths[frame_index])
              
             # Calculate processing time and update process status
-            frame_processing_times.append(timer() - start_timer)
+            frame_processing_times.append(time_for_frame)
             
             if (frame_index + 1) % 8 == 0:
                 average_processing_time = numpy_mean(frame_processing_times)
                 update_process_status_videos(processing_queue, file_number, frame_index, len(extracted_frames_paths), average_processing_time)
 
             if (frame_index + 1) % 100 == 0: frame_processing_times = []
-    
-    # Save frames still in memory
-    if len(upscaled_frame_paths_to_save) > 0:
-        thread = Thread(
-            target = save_multiple_upscaled_frame_async,
-            args = (
-                starting_frames_to_save,
-                upscaled_frames_to_save,
-                upscaled_frame_paths_to_save,
-                selected_interpolation_factor
-            )
-        )
-        thread.start()
-
-        starting_frames_to_save = []
-        upscaled_frames_to_save = []
-        upscaled_frame_paths_to_save = []
 
 def upscale_video_frames_multithreading(
         processing_queue: multiprocessing_Queue,
@@ -1828,7 +4346,8 @@ def upscale_video_frames_multithreading(
         extracted_frames_paths: list[str],
         upscaled_frame_paths: list[str],
         multiframes_number: int,
-        selected_interpolation_factor: float,
+        frames_writer_pool: "FramesWriterPool",
+        held_frames_detector: "HeldFramesDetector" = None
         ) -> None:
     
     def upscale_single_video_frame_async(
@@ -1838,17 +4357,12 @@ def upscale_video_frames_multithreading(
             total_video_frames: int,
             AI_instance: AI,
             extracted_frames_paths: list[str],
-            upscaled_frame_paths: list[str],
-            selected_interpolation_factor: float,
+            upscaled_frame_paths: list[str]
             ) -> None:
 
         global processed_frames_index_async
         global processing_times_async
 
-        starting_frames_to_save      = []
-        upscaled_frames_to_save      = []
-        upscaled_frame_paths_to_save = []
-
         for frame_index in range(len(extracted_frames_paths)):
             frame_path          = extracted_frames_paths[frame_index]
             upscaled_frame_path = upscaled_frame_paths[frame_index]
@@ -1857,31 +4371,12 @@ def upscale_video_frames_multithreading(
             if already_upscaled == False:
                 start_timer = timer()
                 
-                # Upscale frame
+                # Upscale frame, output of the previous frame if held
                 starting_frame = image_read(frame_path)
-                upscaled_frame = AI_instance.AI_orchestration(starting_frame)
-
-                # Adding frames in list to save
-                starting_frames_to_save.append(starting_frame)
-                upscaled_frames_to_save.append(upscaled_frame)
-                upscaled_frame_paths_to_save.append(upscaled_frame_path)
-
-                # Save frames in memory
-                if len(upscaled_frame_paths_to_save) == MULTIPLE_FRAMES_TO_SAVE_MULTITHREAD:
-                    thread = Thread(
-                        target = save_multiple_upscaled_frame_async,
-                        args = (
-                            starting_frames_to_save,
-                            upscaled_frames_to_save,
-                            upscaled_frame_paths_to_save,
-                            selected_interpolation_factor
-                        )
-                    )
-                    thread.start()
-
-                    starting_frames_to_save = []
-                    upscaled_frames_to_save = []
-                    upscaled_frame_paths_to_save = []
+                upscaled_frame = upscale_video_frames_skipping_held(AI_instance, [starting_frame], held_frames_detector)[0]
+
+                # Frame saved by the writers, waiting here if the disk is behind
+                frames_writer_pool.submit(starting_frame, upscaled_frame, upscaled_frame_path)
                 
                 # Calculate processing time and update process status
                 processing_times_async.append((timer() - start_timer)/multiframes_number)
@@ -1893,23 +4388,6 @@ def upscale_video_frames_multithreading(
                 if (processed_frames_index_async + 1) % 100 == 0: processing_times_async = []
         
             processed_frames_index_async +=1
-
-        # Save frames still in memory
-        if len(upscaled_frame_paths_to_save) > 0:
-            thread = Thread(
-                target = save_multiple_upscaled_frame_async,
-                args = (
-                    starting_frames_to_save,
-                    upscaled_frames_to_save,
-                    upscaled_frame_paths_to_save,
-                    selected_interpolation_factor
-                )
-            )
-            thread.start()
-
-            starting_frames_to_save = []
-            upscaled_frames_to_save = []
-            upscaled_frame_paths_to_save = []
     
     total_video_frames         = len(extracted_frames_paths)
     chunk_size                 = total_video_frames // multiframes_number
@@ -1928,8 +4406,7 @@ def upscale_video_frames_multithreading(
                 repeat(total_video_frames),
                 AI_instance_list,
                 frame_list_chunks,
-                upscaled_frame_list_chunks,
-                repeat(selected_interpolation_factor)
+                upscaled_frame_list_chunks
             )
         )
 
@@ -1939,10 +4416,14 @@ def check_forgotten_video_frames(
         AI_instance: AI,
         extracted_frames_paths: list[str],
         upscaled_frame_paths: list[str],
-        selected_interpolation_factor: float,
+        frames_writer_pool: "FramesWriterPool",
+        held_frames_detector: "HeldFramesDetector" = None,
+        static_tiles_detector: "StaticTilesDetector" = None
         ):
     
-    # Check if all the upscaled frames exist
+    # Check if all the upscaled frames exist (every submitted frame already written)
+    frames_writer_pool.flush()
+
     frame_path_todo_list          = []
     upscaled_frame_path_todo_list = []
 
@@ -1959,7 +4440,9 @@ def check_forgotten_video_frames(
             AI_instance,
             frame_path_todo_list,
             upscaled_frame_path_todo_list,
-            selected_interpolation_factor
+            frames_writer_pool,
+            held_frames_detector  = held_frames_detector,
+            static_tiles_detector = static_tiles_detector
         )
 
 
@@ -2029,15 +4512,7 @@ def user_input_checks() -> bool:
         return False
 
     if tiles_resolution > 0: 
-        if selected_AI_model in RealESRGAN_models_list:          
-            vram_multiplier = very_high_VRAM
-        elif selected_AI_model in SRVGGNetCompact_models_list: 
-            vram_multiplier = medium_VRAM
-
-        selected_vram = (vram_multiplier * int(float(str(selected_VRAM_limiter.get()))))
-        tiles_resolution = int(selected_vram * 100)
-
-        
+        tiles_resolution = calculate_tiles_resolution(selected_AI_model, int(float(str(selected_VRAM_limiter.get()))))
     else:
         info_message.set("VRAM/RAM value must be > 0")
         return False
@@ -2057,6 +4532,16 @@ def user_input_checks() -> bool:
 
     return True
 
+def calculate_tiles_resolution(selected_AI_model: str, selected_VRAM: int) -> int:
+    if selected_AI_model in RealESRGAN_models_list:          
+        vram_multiplier = very_high_VRAM
+    elif selected_AI_model in SRVGGNetCompact_models_list: 
+        vram_multiplier = medium_VRAM
+
+    selected_vram = (vram_multiplier * selected_VRAM)
+
+    return int(selected_vram * 100)
+
 def show_error_message(exception: str) -> None:
     messageBox_title    = "Upscale error"
     messageBox_subtitle = "Please report the error on Github or Telegram"
@@ -2151,6 +4636,10 @@ def select_interpolation_from_menu(selected_option: str) -> None:
         case "Medium":   selected_interpolation_factor = 0.5
         case "High":     selected_interpolation_factor = 0.7
 
+def select_AI_precision_from_menu(selected_option: str) -> None:
+    global selected_AI_precision
+    selected_AI_precision = selected_option
+
 def select_gpu_from_menu(selected_option: str) -> None:
     global selected_gpu    
     selected_gpu = selected_option
@@ -2293,7 +4782,8 @@ def open_info_gpu():
         "  • GPU 1 (GPU 0 in Task manager)\n" + 
         "  • GPU 2 (GPU 1 in Task manager)\n" + 
         "  • GPU 3 (GPU 2 in Task manager)\n" + 
-        "  • GPU 4 (GPU 3 in Task manager)\n",
+        "  • GPU 4 (GPU 3 in Task manager)\n" +
+        "  • CPU (AI operations on CPU, for PCs without a compatible GPU)\n",
 
         "\n NOTES\n" +
         "  • Keep in mind that the more powerful the chosen gpu is, the faster the upscaling will be\n" +
@@ -2310,6 +4800,30 @@ def open_info_gpu():
         option_list   = option_list
     )
 
+def open_info_AI_precision():
+    option_list = [
+        "\n AUTO \n" + 
+        " FP32 model on CPU, FP16 model on GPU \n",
+
+        "\n FP32 \n" + 
+        " Full precision model, generated from the FP16 one the first time \n",
+
+        "\n FP16 \n" + 
+        " Half precision model, faster on GPU \n",
+
+        "\n INT8 \n" + 
+        " Quantized model for CPU, generated and calibrated the first time \n" +
+        " Faster on CPU with a small quality loss (see the int8 benchmark) \n"
+    ]
+
+    MessageBox(
+        messageType   = "info",
+        title         = "AI precision",
+        subtitle      = "This widget allows to choose the numeric precision of the AI model",
+        default_value = None,
+        option_list   = option_list
+    )
+
 def open_info_vram_limiter():
     option_list = [
         " It is important to enter the correct value according to the VRAM of selected GPU ",
@@ -2551,6 +5065,13 @@ def place_keep_frames_menu():
     keep_frames_button.place(relx = column1_x, rely = row4_y - 0.053, anchor = "center")
     keep_frames_menu.place(relx = column1_x, rely = row4_y, anchor = "center")
 
+def place_AI_precision_menu():
+    AI_precision_button = create_info_button(open_info_AI_precision, "AI precision")
+    AI_precision_menu   = create_option_menu(select_AI_precision_from_menu, AI_precision_list, default_AI_precision)
+    
+    AI_precision_button.place(relx = column2_x, rely = row3_y - 0.05, anchor = "center")
+    AI_precision_menu.place(relx = column2_x, rely = row3_y, anchor = "center")
+
 def place_image_output_menu():
     file_extension_button = create_info_button(open_info_image_output, "Image output")
     file_extension_menu   = create_option_menu(select_image_extension_from_menu, image_extension_list, default_image_extension)
@@ -2576,7 +5097,7 @@ def place_message_label():
         anchor       = "center",
         corner_radius = 12
     )
-    message_label.place(relx = column2_x, rely = row4_y - 0.075, anchor = "center")
+    message_label.place(relx = column2_x, rely = row4_y - 0.05, anchor = "center")
 
 def place_stop_button(): 
     stop_button = create_active_button(
@@ -2602,6 +5123,384 @@ def place_upscale_button():
 
 
 
+# Benchmark functions ---------------------------
+
+def benchmark_inference_time(AI_instance: AI, image: numpy_ndarray) -> float:
+    AI_instance.AI_orchestration(image) # warmup
+
+    start_timer = timer()
+    for _ in range(BENCHMARK_RUNS): AI_instance.AI_orchestration(image)
+
+    return (timer() - start_timer) / BENCHMARK_RUNS
+
+def benchmark_AI_precision(
+        selected_gpu: str, 
+        cpu_number: int, 
+        image_resolution: int
+        ) -> None:
+    
+    image = numpy_default_rng(0).integers(0, 256, (image_resolution, image_resolution, 3), dtype = uint8)
+
+    print(f"> Benchmark AI precision - {image_resolution}x{image_resolution}px image, GPU option: {selected_gpu}")
+
+    for AI_model_name in AI_models_list:
+        if AI_model_name == AI_LIST_SEPARATOR[0]: continue
+
+        if not os_path_exists(find_by_relative_path(f"AI-onnx{os_separator}{AI_model_name}_fp16.onnx")):
+            print(f"  {AI_model_name}: model file not found")
+            continue
+
+        inference_times = {}
+        for AI_precision in [ "FP32", "FP16" ]:
+            AI_instance = AI(AI_model_name, selected_gpu, 1, image_resolution, cpu_number, AI_precision = AI_precision)
+            inference_times[AI_precision] = benchmark_inference_time(AI_instance, image)
+
+        print(f"  {AI_model_name} on {AI_instance.execution_provider}: "
+              f"fp32 {inference_times['FP32'] * 1000:.1f}ms • "
+              f"fp16 {inference_times['FP16'] * 1000:.1f}ms • "
+              f"fp32 speedup x{inference_times['FP16'] / inference_times['FP32']:.2f}")
+
+
+
+
+def calculate_PSNR(reference_image: numpy_ndarray, image: numpy_ndarray) -> float:
+    mean_squared_error = numpy_mean((reference_image.astype(float32) - image.astype(float32)) ** 2)
+    if mean_squared_error == 0: return float("inf")
+    return float(10 * numpy_log10(255 ** 2 / mean_squared_error))
+
+def benchmark_AI_int8(
+        selected_gpu: str, 
+        cpu_number: int, 
+        image_resolution: int
+        ) -> None:
+    
+    # Ground truth image downscaled by the model factor then upscaled, 
+    # PSNR of fp32 and int8 upscales against the ground truth and against each other
+    y, x = numpy_mgrid[0:image_resolution, 0:image_resolution].astype(float32) / image_resolution
+    ground_truth = numpy_stack([0.5 + 0.5 * numpy_sin(40 * x * y), x, 0.5 + 0.5 * numpy_sin(25 * (x - y))], axis = 2)
+    ground_truth[image_resolution // 4:image_resolution // 2, image_resolution // 3:image_resolution // 2] = 0.9
+    ground_truth = (ground_truth * 255).astype(uint8)
+
+    print(f"> Benchmark AI int8 - {image_resolution}x{image_resolution}px ground truth image, GPU option: {selected_gpu}")
+
+    for AI_model_name in AI_models_list:
+        if AI_model_name == AI_LIST_SEPARATOR[0]: continue
+
+        if not os_path_exists(find_by_relative_path(f"AI-onnx{os_separator}{AI_model_name}_fp16.onnx")):
+            print(f"  {AI_model_name}: model file not found")
+            continue
+
+        fp32_AI_instance = AI(AI_model_name, selected_gpu, 1, image_resolution, cpu_number, AI_precision = "FP32")
+        int8_AI_instance = AI(AI_model_name, selected_gpu, 1, image_resolution, cpu_number, AI_precision = "INT8")
+        if int8_AI_instance.AI_precision != "int8":
+            print(f"  {AI_model_name}: int8 model not available")
+            continue
+
+        upscale_factor = fp32_AI_instance.upscale_factor
+        low_resolution = image_resolution // upscale_factor
+        image          = opencv_resize(ground_truth, (low_resolution, low_resolution), interpolation = INTER_AREA)
+        ground_truth_crop = ground_truth[:low_resolution * upscale_factor, :low_resolution * upscale_factor]
+
+        fp32_time  = benchmark_inference_time(fp32_AI_instance, image)
+        int8_time  = benchmark_inference_time(int8_AI_instance, image)
+        fp32_image = fp32_AI_instance.AI_orchestration(image)
+        int8_image = int8_AI_instance.AI_orchestration(image)
+
+        fp32_PSNR = calculate_PSNR(ground_truth_crop, fp32_image)
+        int8_PSNR = calculate_PSNR(ground_truth_crop, int8_image)
+
+        print(f"  {AI_model_name} on {int8_AI_instance.execution_provider}: "
+              f"fp32 {fp32_time * 1000:.1f}ms • "
+              f"int8 {int8_time * 1000:.1f}ms • "
+              f"int8 speedup x{fp32_time / int8_time:.2f} • "
+              f"PSNR fp32 {fp32_PSNR:.2f}dB, int8 {int8_PSNR:.2f}dB (delta {int8_PSNR - fp32_PSNR:+.2f}dB) • "
+              f"int8 vs fp32 {calculate_PSNR(fp32_image, int8_image):.2f}dB")
+
+
+
+
+def benchmark_allocated_bytes(function: Callable, *arguments) -> int:
+    tracemalloc_start()
+    tracemalloc_reset_peak()
+    memory_before, _ = tracemalloc_get_traced_memory()
+    function(*arguments)
+    _, memory_peak = tracemalloc_get_traced_memory()
+    tracemalloc_stop()
+
+    return memory_peak - memory_before
+
+def benchmark_pre_post_processing_allocations(
+        selected_AI_model: str,
+        selected_gpu: str, 
+        cpu_number: int
+        ) -> None:
+    
+    # Pre/post-processing of a 1080p frame, the AI output is simulated
+    # (same for both the pipelines, the inference buffers are preallocated once for each video)
+    
+    def legacy_pre_post_processing(image: numpy_ndarray, onnx_output: numpy_ndarray) -> numpy_ndarray:
+        image = image.astype(float32)
+        range = 65535 if numpy_max(image) > 256 else 255
+        image = image / range
+        image = numpy_transpose(image, (2, 0, 1))[None]
+        numpy_copyto(input_buffer, image, casting = "unsafe")
+
+        output = numpy_clip(onnx_output[0], 0, 1)
+        output = numpy_transpose(output, (1, 2, 0)).astype(float32)
+        match range:
+            case 255:   return (output * range).astype(uint8)
+            case 65535: return (output * range).round().astype(float32)
+
+    def pre_post_processing(image: numpy_ndarray, onnx_output: numpy_ndarray) -> numpy_ndarray:
+        range        = AI_instance.get_image_range(image)
+        output_image = numpy_empty((t_height, t_width, 3), dtype = image.dtype)
+        AI_instance.preprocess_image(image, range, input_buffer[0])
+        AI_instance.postprocess_output(onnx_output[0], range, output_image)
+        return output_image
+
+    height, width     = 1080, 1920
+    AI_instance       = AI(selected_AI_model, selected_gpu, 1, width, cpu_number)
+    t_height, t_width = height * AI_instance.upscale_factor, width * AI_instance.upscale_factor
+    random_generator  = numpy_default_rng(0)
+    input_buffer      = numpy_empty((1, 3, height, width), dtype = float32)
+    onnx_output       = random_generator.random((1, 3, t_height, t_width), dtype = float32)
+    upscaled_frame_MB = t_height * t_width * 3 / 1024**2
+
+    print(f"> Benchmark pre/post-processing allocations - {width}x{height}px frame, {selected_AI_model} output {t_width}x{t_height}px")
+    print(f"  (uint8 upscaled frame: {upscaled_frame_MB:.0f}MB)")
+
+    for image_dtype, max_value in [ (uint8, 255), (uint16, 65535) ]:
+        image = random_generator.integers(0, max_value + 1, (height, width, 3), dtype = image_dtype)
+
+        legacy_allocated_bytes = benchmark_allocated_bytes(legacy_pre_post_processing, image, onnx_output)
+        allocated_bytes        = benchmark_allocated_bytes(pre_post_processing, image, onnx_output)
+
+        print(f"  {image_dtype.__name__} frame: "
+              f"legacy {legacy_allocated_bytes / 1024**2:.0f}MB • "
+              f"low-copy {allocated_bytes / 1024**2:.0f}MB allocated for each frame")
+
+
+
+
+# Autotune functions ---------------------------
+
+def get_autotune_key(AI_instance: AI) -> str:
+    # Same model, provider, precision and memory ceiling on this machine, 
+    # the same settings for the GUI and the CLI (different default cpus)
+    return f"{AI_instance.AI_model_name}_{AI_instance.execution_provider}_{AI_instance.AI_precision}_{AI_instance.max_resolution}px"
+
+def read_autotune_cache() -> dict:
+    if not os_path_exists(AUTOTUNE_PATH): return {}
+
+    try:
+        with open(AUTOTUNE_PATH, "r") as autotune_file:
+            return json_load(autotune_file)
+    except Exception:
+        return {}
+
+def get_autotuned_tiles_settings(AI_instance: AI) -> dict | None:
+    return read_autotune_cache().get(get_autotune_key(AI_instance))
+
+def calculate_autotune_candidates(max_resolution: int, cpu_number: int) -> tuple:
+    tile_sizes = []
+    tile_size  = max_resolution
+    while tile_size >= AUTOTUNE_MIN_TILE_SIZE and len(tile_sizes) < 3:
+        tile_sizes.append(tile_size)
+        tile_size = tile_size // 2
+
+    tiles_workers = [workers for workers in (1, 2, 4) if workers <= max(cpu_number, 1)]
+
+    return tile_sizes or [max_resolution], tiles_workers
+
+def autotune_tiles_settings(
+        selected_AI_model: str,
+        selected_gpu: str,
+        cpu_number: int,
+        selected_AI_precision: str,
+        tiles_resolution: int,
+        session_settings: dict = None
+        ) -> dict:
+
+    # Short timed trials on an image 1.5x the memory ceiling, the fastest
+    # tile size/workers within the ceiling is cached for this machine
+    AI_instance = AI(selected_AI_model, selected_gpu, 1, tiles_resolution, cpu_number, session_settings, selected_AI_precision)
+    image_size  = tiles_resolution + tiles_resolution // 2
+    image       = numpy_default_rng(0).integers(0, 256, (image_size, image_size, 3), dtype = uint8)
+
+    print(f"> Autotune {selected_AI_model} on {AI_instance.execution_provider} ({AI_instance.AI_precision}), "
+          f"memory ceiling {tiles_resolution}x{tiles_resolution}px")
+
+    tile_sizes, tiles_workers_list = calculate_autotune_candidates(tiles_resolution, cpu_number)
+    trials_times = {}
+
+    for tile_size in tile_sizes:
+        for tiles_workers in tiles_workers_list:
+            AI_instance.set_tiles_settings(tile_size, tiles_workers)
+            AI_instance.AI_upscale_with_tilling(image) # warmup, inference buffers for this tile shape
+
+            start_timer = timer()
+            for _ in range(AUTOTUNE_RUNS): AI_instance.AI_upscale_with_tilling(image)
+            trials_times[(tile_size, tiles_workers)] = (timer() - start_timer) / AUTOTUNE_RUNS
+
+            print(f"  tile {tile_size}px • {tiles_workers} workers • batch {AI_instance.calculate_tiles_batch_size()}: "
+                  f"{trials_times[(tile_size, tiles_workers)] * 1000:.0f}ms")
+
+    AI_instance.close_tiles_pool()
+
+    best_tile_size, best_tiles_workers = min(trials_times, key = trials_times.get)
+    autotuned_settings = { "tile_size": best_tile_size, "tiles_workers": best_tiles_workers }
+
+    autotune_cache = read_autotune_cache()
+    autotune_cache[get_autotune_key(AI_instance)] = autotuned_settings
+    os_makedirs(AI_CACHE_PATH, exist_ok = True)
+    with open(AUTOTUNE_PATH, "w") as autotune_file:
+        autotune_file.write(json_dumps(autotune_cache, indent = 4))
+
+    default_time = trials_times[(tile_sizes[0], 1)]
+    print(f"  Fastest: tile {best_tile_size}px • {best_tiles_workers} workers, "
+          f"x{default_time / trials_times[(best_tile_size, best_tiles_workers)]:.2f} faster than the default, saved in {AUTOTUNE_PATH}")
+
+    return autotuned_settings
+
+
+
+
+# Command line functions ---------------------------
+
+def command_line_upscale(arguments: list[str]) -> None:
+
+    # Headless upscale, same pipeline of the GUI without the window
+    parser = ArgumentParser(prog = app_name, description = f"{app_name} {version} - headless upscale")
+    parser.add_argument("--input",              nargs = "+", help = "image/video files to upscale")
+    parser.add_argument("--output",             default = OUTPUT_PATH_CODED,                  help = "output directory (default: same path as input files)")
+    parser.add_argument("--model",              default = default_AI_model, choices = [model for model in AI_models_list if model != AI_LIST_SEPARATOR[0]])
+    parser.add_argument("--gpu",                default = default_gpu,      choices = gpus_list)
+    parser.add_argument("--vram",               default = int(float(default_VRAM_limiter)), type = int, help = "GPU VRAM / RAM (GB) used to calculate tiles resolution")
+    parser.add_argument("--cpu",                default = os_cpu_count(), type = int, help = "cpus used for video frames extraction/encoding and CPU inference")
+    parser.add_argument("--resize",             default = int(float(default_resize_factor)), type = int, help = "input resolution %%")
+    parser.add_argument("--threads",            default = int(default_AI_multithreading.split()[0]), type = int, help = "AI multithreading for videos")
+    parser.add_argument("--sessions",           default = 0, type = int, help = "AI sessions shared by the threads (0 = auto)")
+    parser.add_argument("--interpolation",      default = default_interpolation,   choices = interpolation_list)
+    parser.add_argument("--image-extension",    default = default_image_extension, choices = image_extension_list)
+    parser.add_argument("--video-extension",    default = default_video_extension, choices = video_extension_list)
+    parser.add_argument("--keep-frames",        action  = "store_true")
+    parser.add_argument("--precision",          default = AI_precision_list[0], choices = AI_precision_list, help = "AI model precision (Auto = fp32 on CPU, fp16 on GPU, INT8 = quantized fp32 model for CPU)")
+    parser.add_argument("--tile-size",          default = 0, type = int, help = "tiles resolution (px) for images bigger than the VRAM limit, batched in the VRAM limit (0 = calibrated or VRAM limit)")
+    parser.add_argument("--tile-workers",       default = 0, type = int, help = "threads upscaling tiles batches in parallel (0 = calibrated or 1)")
+    parser.add_argument("--ram-budget",         default = OUTPUT_RAM_BUDGET_GB, type = float, help = "upscaled images bigger than this (GB) are memory-mapped on disk and encoded in strips (0 = always in RAM)")
+    parser.add_argument("--calibrate",          action  = "store_true", help = "find and cache the fastest tile size and tile workers for model, GPU, precision and VRAM")
+    parser.add_argument("--video-streaming",    action  = "store_true", help = "videos decoded, upscaled and encoded in a stream, without frame files on disk (--keep-frames ignored)")
+    parser.add_argument("--video-journal",      action  = "store_true", help = "streamed videos encoded in segments listed in a journal, a stopped upscale continues from the last segment (implies --video-streaming)")
+    parser.add_argument("--video-codec",        default = None, help = "ffmpeg video encoder (default: libx264/libx265/png of --video-extension)")
+    parser.add_argument("--video-crf",          default = None, type = int, help = "constant quality of the video encoder instead of the 12M bitrate")
+    parser.add_argument("--video-preset",       default = None, help = "x264/x265 preset (default: ultrafast)")
+    parser.add_argument("--video-pix-fmt",      default = None, help = "ffmpeg output pixel format (default: yuv420p for x264/x265)")
+    parser.add_argument("--skip-held-frames",   action  = "store_true", help = "video frames (almost) identical to the last upscaled one reuse its upscaled output")
+    parser.add_argument("--held-frames-threshold", default = HELD_FRAMES_THRESHOLD, type = float, help = "max difference (0-255) of held frames on a downsampled copy")
+    parser.add_argument("--reuse-static-tiles", action  = "store_true", help = "video frames upscaled in tiles, only the tiles changed since the previous frame upscaled again")
+    parser.add_argument("--static-tiles-threshold", default = STATIC_TILES_THRESHOLD, type = float, help = "max difference (0-255) of static tiles on a downsampled copy")
+    parser.add_argument("--no-warmup",          action  = "store_true", help = "no AI warmup run at the input shape of the first file while it is decoded/extracted")
+
+    # Benchmarks
+    parser.add_argument("--benchmark",          default = None, choices = benchmark_list)
+    parser.add_argument("--benchmark-resolution", default = 256, type = int, help = "benchmark image resolution (px)")
+
+    # Onnxruntime SessionOptions
+    parser.add_argument("--graph-optimization", default = None, choices = graph_optimization_list)
+    parser.add_argument("--execution-mode",     default = None, choices = execution_mode_list)
+    parser.add_argument("--intra-op-threads",   default = None, type = int, help = "0 = onnxruntime default")
+    parser.add_argument("--inter-op-threads",   default = None, type = int, help = "0 = onnxruntime default")
+    parser.add_argument("--no-memory-pattern",  action  = "store_true")
+    parser.add_argument("--no-cpu-arena",       action  = "store_true")
+
+    args = parser.parse_args(arguments)
+
+    if args.resize <= 0 or args.vram <= 0 or args.cpu <= 0:
+        parser.error("--resize, --vram and --cpu must be > 0")
+    if args.tile_size < 0 or args.tile_workers < 0:
+        parser.error("--tile-size and --tile-workers must be >= 0")
+
+    match args.benchmark:
+        case "precision":
+            benchmark_AI_precision(args.gpu, args.cpu, args.benchmark_resolution)
+            return
+        case "allocations":
+            benchmark_pre_post_processing_allocations(args.model, args.gpu, args.cpu)
+            return
+        case "int8":
+            benchmark_AI_int8(args.gpu, args.cpu, args.benchmark_resolution)
+            return
+
+    # Session settings overrides, the others are the defaults for the selected execution provider
+    AI_session_settings = {}
+    if args.graph_optimization != None: AI_session_settings["graph_optimization_level"] = args.graph_optimization
+    if args.execution_mode     != None: AI_session_settings["execution_mode"]           = args.execution_mode
+    if args.intra_op_threads   != None: AI_session_settings["intra_op_threads"]         = args.intra_op_threads
+    if args.inter_op_threads   != None: AI_session_settings["inter_op_threads"]         = args.inter_op_threads
+    if args.no_memory_pattern:          AI_session_settings["memory_pattern"]           = False
+    if args.no_cpu_arena:               AI_session_settings["cpu_arena"]                = False
+
+    # Video encoding overrides, the others are the defaults for the selected video extension
+    video_encoding_settings = {}
+    if args.video_codec   != None: video_encoding_settings["codec"]   = args.video_codec
+    if args.video_crf     != None: video_encoding_settings["crf"]     = args.video_crf
+    if args.video_preset  != None: video_encoding_settings["preset"]  = args.video_preset
+    if args.video_pix_fmt != None: video_encoding_settings["pix_fmt"] = args.video_pix_fmt
+
+    if args.calibrate:
+        autotune_tiles_settings(args.model, args.gpu, args.cpu, args.precision, calculate_tiles_resolution(args.model, args.vram), AI_session_settings)
+        if args.input == None: return
+
+    if args.input == None:
+        parser.error("--input is required")
+
+    selected_file_list = check_supported_selected_files([os_path_abspath(file) for file in args.input])
+    if len(selected_file_list) == 0:
+        parser.error("no supported files selected")
+
+    selected_interpolation_factor = {
+        "Disabled": 0,
+        "Low": 0.3,
+        "Medium": 0.5,
+        "High": 0.7,
+    }.get(args.interpolation)
+
+    # Same process, statuses printed and only the last one read at the end
+    processing_queue = queue_Queue(maxsize=1)
+
+    upscale_orchestrator(
+        processing_queue,
+        selected_file_list,
+        args.output,
+        args.model,
+        args.gpu,
+        args.image_extension,
+        calculate_tiles_resolution(args.model, args.vram),
+        args.resize / 100,
+        args.cpu,
+        args.video_extension,
+        selected_interpolation_factor,
+        args.threads,
+        args.keep_frames,
+        AI_session_settings,
+        args.sessions,
+        args.precision,
+        args.tile_size,
+        args.tile_workers,
+        args.ram_budget,
+        not args.no_warmup,
+        args.video_streaming or args.video_journal,
+        args.video_journal,
+        video_encoding_settings,
+        args.held_frames_threshold if args.skip_held_frames else None,
+        args.static_tiles_threshold if args.reuse_static_tiles else None
+    )
+
+    if ERROR_STATUS in processing_queue.get_nowait(): sys.exit(1)
+
+
+
+
 # Main functions ---------------------------
 
 def on_app_close() -> None:
@@ -2614,6 +5513,7 @@ def on_app_close() -> None:
     global selected_interpolation_factor
     global selected_image_extension
     global selected_video_extension
+    global selected_AI_precision
     global tiles_resolution
     global resize_factor
     global cpu_number
@@ -2643,6 +5543,7 @@ def on_app_close() -> None:
         "default_resize_factor":     str(selected_resize_factor.get()),
         "default_VRAM_limiter":      str(selected_VRAM_limiter.get()),
         "default_cpu_number":        str(selected_cpu_number.get()),
+        "default_AI_precision":      selected_AI_precision,
     }
     user_preference_json = json_dumps(user_preference)
     with open(USER_PREFERENCE_PATH, "w") as preference_file:
@@ -2679,11 +5580,17 @@ class App():
 
         place_image_output_menu()
         place_video_extension_menu()
+        place_AI_precision_menu()
         place_message_label()
         place_upscale_button()
 
 if __name__ == "__main__":
     multiprocessing_freeze_support()
+
+    if len(sys.argv) > 1:
+        command_line_upscale(sys.argv[1:])
+        sys.exit()
+
     set_appearance_mode("Dark")
     set_default_color_theme("dark-blue")
     
@@ -2705,6 +5612,7 @@ if __name__ == "__main__":
     global selected_image_extension
     global selected_video_extension
     global selected_interpolation_factor
+    global selected_AI_precision
     global tiles_resolution
     global resize_factor
     global cpu_number
@@ -2716,6 +5624,7 @@ if __name__ == "__main__":
     selected_image_extension   = default_image_extension
     selected_video_extension   = default_video_extension
     selected_AI_multithreading = int(default_AI_multithreading.split()[0])
+    selected_AI_precision      = default_AI_precision
     
     selected_keep_frames = True if default_keep_frames == "Enabled" else False
 